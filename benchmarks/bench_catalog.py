@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks of the catalog pipeline against a local fake pypi (see fake_pypi.py), no network access needed
+
+For each size of the synthetic plugin set, measure:
+
+* get_plugins with an empty metadata cache (cold)
+* get_plugins with a filled metadata cache and snapshot (warm)
+* the same two runs for a pinned pymodaq version, resolving the compatible release of each plugin
+* write_plugin_doc (README, plugin list and compressed catalog written in a temporary folder)
+* the memory peak (tracemalloc) of the cold get_plugins and of write_plugin_doc
+
+Results are compared to baseline.json, the script exits with a non zero code if a measure is slower (or bigger) than
+its baseline by more than the tolerance. Timings depend on the machine: save a baseline on the machine used for the
+comparison (--save-baseline).
+
+Usage: python benchmarks/bench_catalog.py [--sizes 50 500 5000] [--latency 0.01] [--pymodaq-version 4.4.0]
+[--save-baseline]
+"""
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from packaging.version import Version
+
+from pymodaq_plugin_manager import session
+from pymodaq_plugin_manager.cache import MetadataCache
+from pymodaq_plugin_manager.validate import get_plugins, write_plugin_doc
+
+sys.path.insert(0, str(Path(__file__).parent))
+from fake_pypi import FakePyPI  # noqa: E402
+
+ROOT_PATH = Path(__file__).parent.parent
+BASELINE_PATH = Path(__file__).parent.joinpath('baseline.json')
+SIZES = (50, 500, 5000)
+LATENCY = 0.01  # in seconds
+PYMODAQ_VERSION = '4.4.0'  # pinned version of the pinned runs, served by the fake pypi
+TOLERANCE = 0.25  # relative
+MIN_DELTA = 0.05  # in seconds or MB, differences below are considered as noise
+
+
+def quiet(message):
+    pass
+
+
+def silence_loggers():
+    for name in ('pymodaq_plugin_manager.validate', 'pymodaq_plugin_manager.pypi',
+                 'pymodaq_plugin_manager.artifact'):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+
+def preload_modules():
+    """Import the modules imported lazily by the pipeline, so that their import is not measured"""
+    import jsonschema  # noqa: F401
+    import pytablewriter  # noqa: F401
+    import requests  # noqa: F401
+    import yawrap  # noqa: F401
+    import pymodaq_utils.packages  # noqa: F401
+    import readme_renderer.rst  # noqa: F401
+
+
+def measure(function, trace_memory=False):
+    """Call function and return its duration in seconds and memory peak in MB (None if not traced)"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start
+    peak = None
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return duration, peak
+
+
+def run_size(n_plugins: int, latency: float, pymodaq_version: str = PYMODAQ_VERSION) -> dict:
+    """Run the benchmarks for a plugin set of a given size"""
+    tmp_path = Path(tempfile.mkdtemp(prefix='pymodaq_plugin_bench_'))
+    try:
+        shutil.copy(ROOT_PATH.joinpath('README_base.md'), tmp_path)
+        tmp_path.joinpath('doc').mkdir()
+        with FakePyPI(n_plugins, latency) as server:
+            session.set_index_url(server.url)
+            session.close_session()
+
+            cache = MetadataCache(tmp_path.joinpath('cache'))
+            cold, cold_peak = measure(lambda: get_plugins(print_method=quiet, cache=cache), trace_memory=True)
+            cold_requests = server.requests
+            warm, _ = measure(lambda: get_plugins(print_method=quiet, cache=cache))
+            warm_requests = server.requests - cold_requests
+
+            pinned_cache = MetadataCache(tmp_path.joinpath('pinned_cache'))
+            start_requests = server.requests
+            pinned_cold, _ = measure(lambda: get_plugins(pymodaq_version=Version(pymodaq_version),
+                                                         print_method=quiet, cache=pinned_cache))
+            pinned_cold_requests = server.requests - start_requests
+            pinned_warm, _ = measure(lambda: get_plugins(pymodaq_version=Version(pymodaq_version),
+                                                         print_method=quiet, cache=pinned_cache))
+
+            doc_cache = MetadataCache(tmp_path.joinpath('doc_cache'))
+            doc, doc_peak = measure(lambda: write_plugin_doc(root_path=tmp_path,
+                                                             catalog_path=tmp_path.joinpath('catalog.json.gz'),
+                                                             cache=doc_cache),
+                                    trace_memory=True)
+    finally:
+        session.set_index_url()
+        session.close_session()
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    return dict(get_plugins_cold=cold, get_plugins_warm=warm, write_plugin_doc=doc,
+                get_plugins_pinned_cold=pinned_cold, get_plugins_pinned_warm=pinned_warm,
+                get_plugins_cold_peak_mb=cold_peak, write_plugin_doc_peak_mb=doc_peak,
+                cold_requests=cold_requests, warm_requests=warm_requests, pinned_cold_requests=pinned_cold_requests)
+
+
+def compare(results: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """Get the list of the measures that regressed compared to the baseline"""
+    regressions = []
+    for size, measures in results.items():
+        for key, value in measures.items():
+            reference = baseline.get(size, dict([])).get(key)
+            if reference is None or value is None:
+                continue
+            if value > reference * (1 + tolerance) and value - reference > MIN_DELTA:
+                regressions.append(f'{size} plugins, {key}: {value:.3f} (baseline {reference:.3f})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the catalog pipeline against a local fake pypi')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='sizes of the synthetic plugin sets')
+    parser.add_argument('--latency', type=float, default=LATENCY,
+                        help='delay added to each request of the fake pypi in seconds')
+    parser.add_argument('--pymodaq-version', default=PYMODAQ_VERSION, help='pymodaq version of the pinned runs')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='relative slow down above which a measure is reported as a regression')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store the results as the new baseline instead of comparing them')
+    args = parser.parse_args()
+    silence_loggers()
+    preload_modules()
+
+    results = dict([])
+    for size in args.sizes:
+        results[str(size)] = run_size(size, args.latency, args.pymodaq_version)
+        print(f'{size} plugins: ' + ', '.join(f'{key}={value:.3f}' if isinstance(value, float) else f'{key}={value}'
+                                               for key, value in results[str(size)].items()))
+
+    if args.save_baseline:
+        baseline = dict([])
+        if args.baseline.is_file():
+            baseline = json.loads(args.baseline.read_text())
+        baseline.update(results)
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + '\n')
+        print(f'Baseline saved in {args.baseline}')
+        return 0
+
+    if not args.baseline.is_file():
+        print(f'No baseline found in {args.baseline}, run with --save-baseline first')
+        return 0
+    regressions = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
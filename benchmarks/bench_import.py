@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Import time budget of the plugin_manager entry point
+
+The plugin manager window should be displayed before the modules only needed later (numpy, readme_renderer,
+pymodaq_utils.packages, distlib, pytablewriter, yawrap, jsonschema, requests, lxml, pymodaq) are imported. This script
+imports pymodaq_plugin_manager.manager in a fresh interpreter with -X importtime, and exits with a non zero code if
+one of those modules got imported or if the cumulative import time exceeds the budget.
+
+Usage: python benchmarks/bench_import.py [--budget 0.3] [--runs 5]
+(the deferred modules, not the timing budget, are also checked by tests/test_import_time.py)
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+MODULE = 'pymodaq_plugin_manager.manager'
+BUDGET = 0.3  # in seconds, best of the runs
+DEFERRED_MODULES = ('numpy', 'readme_renderer', 'pymodaq_utils.packages', 'distlib', 'pytablewriter', 'yawrap',
+                    'jsonschema', 'requests', 'lxml', 'pymodaq')
+
+
+def measure_import(module: str = MODULE):
+    """Import a module in a fresh interpreter
+
+    Returns
+    -------
+    float: the cumulative import time of the module in seconds
+    dict: the cumulative import time in seconds of every imported module
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, text=True, check=True)
+    times = dict([])
+    for line in process.stderr.splitlines():
+        match = re.match(r'import time:\s*\d+\s*\|\s*(\d+)\s*\|(\s*)(\S+)', line)
+        if match is not None:
+            times[match.group(3)] = int(match.group(1)) * 1e-6
+    return times[module], times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=f'Check the import time budget of {MODULE}')
+    parser.add_argument('--budget', type=float, default=BUDGET, help='maximum import time in seconds')
+    parser.add_argument('--runs', type=int, default=5, help='number of imports, the best one is kept')
+    args = parser.parse_args()
+
+    results = [measure_import() for _ in range(max(1, args.runs))]
+    import_time, times = min(results, key=lambda result: result[0])
+    print(f'{MODULE} imported in {import_time * 1000:.0f} ms (budget {args.budget * 1000:.0f} ms)')
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[1:11]
+    print('Slowest imports: ' + ', '.join(f'{name} {duration * 1000:.0f} ms' for name, duration in slowest))
+
+    failures = [f'{module} is imported' for module in DEFERRED_MODULES if module in times]
+    if import_time > args.budget:
+        failures.append('import time over budget')
+    for failure in failures:
+        print(f'Failure: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
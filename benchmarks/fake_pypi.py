@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""
+Local stand-in for the pypi server serving a synthetic set of PyMoDAQ plugins
+
+It serves the json form of the simple api (PEP 691, with last serials) and the json api (project and release
+metadata, with ETag revalidation), with a configurable latency added to each request. Error responses can be injected
+for given paths (see FakePyPI.add_failure) to exercise the retries and the handling of failed packages.
+
+Usage: python fake_pypi.py -n 500 --latency 0.05 (then set PYMODAQ_PLUGIN_INDEX_URL to the printed url)
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Dict, List, Optional
+
+SIMPLE_JSON = 'application/vnd.pypi.simple.v1+json'
+PYMODAQ_RELEASES = ['4.3.0', '4.4.0', '4.4.7', '5.0.0', '5.0.6', '5.1.0']
+PLUGIN_RELEASES = [('1.0.0', 'pymodaq>=4.3,<5.0'), ('1.1.0', 'pymodaq>=4.4,<5.0'), ('2.0.0', 'pymodaq>=5.0')]
+NOISE_PACKAGES = 1000  # packages not matching the plugin names in the simple index
+
+DESCRIPTION = '''{name}
+{underline}
+
+PyMoDAQ plugin for the synthetic instruments of the benchmark number {index}.
+
+Authors
+=======
+
+* Benchmark Author
+
+Instruments
+===========
+
+Below is the list of instruments included in this plugin
+
+Actuators
++++++++++
+
+* **Stage{index}**: synthetic motorized stage
+* **Rotation{index}**: synthetic rotation stage
+
+Viewer0D
+++++++++
+
+* **Powermeter{index}**: synthetic power meter
+
+Viewer2D
+++++++++
+
+* **Camera{index}**: synthetic camera
+'''
+
+
+def make_catalog(n_plugins: int) -> Dict[str, dict]:
+    """Generate the projects served by the fake index: {name: {'serial': int, 'releases': {version: metadata}}}"""
+    projects = dict([])
+    serial = 1
+    for ind in range(NOISE_PACKAGES):
+        projects[f'noise-package-{ind}'] = dict(serial=serial, releases={'1.0': None})
+        serial += 1
+    projects['pymodaq'] = dict(serial=serial, releases={version: dict(requires_dist=None)
+                                                        for version in PYMODAQ_RELEASES})
+    for ind in range(n_plugins):
+        serial += 1
+        name = f'pymodaq_plugins_synth{ind:05d}'
+        description = DESCRIPTION.format(name=name, underline='=' * len(name), index=ind)
+        projects[name] = dict(serial=serial, releases={version: dict(requires_dist=[requirement],
+                                                                     description=description)
+                                                       for version, requirement in PLUGIN_RELEASES})
+    return projects
+
+
+class FakePyPI:
+    """Fake index running in a background thread
+
+    Parameters
+    ----------
+    n_plugins: int
+        number of synthetic plugins
+    latency: float
+        delay (in seconds) added to each response
+    """
+
+    def __init__(self, n_plugins: int = 50, latency: float = 0.):
+        self.projects = make_catalog(n_plugins)
+        self.latency = latency
+        self.requests = 0
+        self.failures: Dict[str, List[dict]] = dict([])  # path: error responses served before the normal ones
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}'
+
+    def start(self) -> 'FakePyPI':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def add_failure(self, path: str, status: int = 503, count: Optional[int] = 1, retry_after: str = None):
+        """Answer the next requests of a path (for instance /pypi/<name>/json) with an error
+
+        Parameters
+        ----------
+        path: str
+        status: int
+            the status code of the error responses
+        count: int
+            the number of requests answered with the error, all of them if None
+        retry_after: str
+            value of the Retry-After header of the error responses, if any
+        """
+        with self._lock:
+            self.failures.setdefault(path, []).append(dict(status=status, count=count, retry_after=retry_after))
+
+    def _pop_failure(self, path: str) -> Optional[dict]:
+        with self._lock:
+            failures = self.failures.get(path, [])
+            if len(failures) == 0:
+                return None
+            failure = failures[0]
+            if failure['count'] is not None:
+                failure['count'] -= 1
+                if failure['count'] <= 0:
+                    failures.pop(0)
+            return failure
+
+    def _project_json(self, name: str, version: str = None):
+        project = self.projects.get(name)
+        if project is None or (version is not None and version not in project['releases']):
+            return None
+        latest = version if version is not None else list(project['releases'])[-1]
+        release = project['releases'][latest] or dict([])
+        content = {'info': {'name': name, 'version': latest, 'author': 'Benchmark Author',
+                            'description': release.get('description', ''),
+                            'project_url': f'https://pypi.org/project/{name}/',
+                            'requires_dist': release.get('requires_dist')},
+                   'last_serial': project['serial']}
+        if version is None:
+            content['releases'] = {release: [] for release in project['releases']}
+        return content
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code: int, body: bytes = b'', content_type='application/json', etag: str = None,
+                      retry_after: str = None):
+                self.send_response(code)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                if etag is not None:
+                    self.send_header('ETag', etag)
+                if retry_after is not None:
+                    self.send_header('Retry-After', retry_after)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                fake._count()
+                if fake.latency > 0:
+                    time.sleep(fake.latency)
+                failure = fake._pop_failure(self.path)
+                if failure is not None:
+                    return self._send(failure['status'], retry_after=failure['retry_after'])
+                if self.path.rstrip('/') == '/simple':
+                    content = {'meta': {'api-version': '1.1'},
+                               'projects': [{'name': name, '_last-serial': project['serial']}
+                                            for name, project in fake.projects.items()]}
+                    return self._send(200, json.dumps(content).encode(), SIMPLE_JSON)
+                match = re.fullmatch(r'/pypi/([^/]+)/(?:([^/]+)/)?json', self.path)
+                content = fake._project_json(*match.groups()) if match is not None else None
+                if content is None:
+                    return self._send(404)
+                etag = f'"{content["last_serial"]}-{match.group(2)}"'
+                if self.headers.get('If-None-Match') == etag:
+                    return self._send(304, etag=etag)
+                self._send(200, json.dumps(content).encode(), etag=etag)
+
+        return Handler
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fake pypi server serving synthetic PyMoDAQ plugins')
+    parser.add_argument('-n', type=int, default=50, dest='n_plugins', help='number of plugins')
+    parser.add_argument('--latency', type=float, default=0., help='delay added to each request in seconds')
+    args = parser.parse_args()
+    with FakePyPI(args.n_plugins, args.latency) as server:
+        print(f'Serving {args.n_plugins} plugins on {server.url}')
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Compressed catalog of the plugins published on pypi, generated by the weekly write_plugins_doc workflow
+
+Loading it takes a few milliseconds and doesn't need any network access (cold starts, air-gapped lab computers). The
+file is deterministic (no timestamp, fixed gzip header) so that it only changes when the catalog itself changes.
+"""
+import gzip
+import io
+import json
+import logging
+from hashlib import sha256
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+from packaging.version import Version
+
+from pymodaq_plugin_manager.catalog import PluginRecord
+from pymodaq_plugin_manager.pypi import get_series_key
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+
+CATALOG_NAME = 'pymodaq-plugin-catalog'
+CATALOG_FORMAT = 1  # to be incremented for each incompatible change of the file layout
+DATA_PATH = Path(__file__).parent.joinpath('data')
+CATALOG_PATH = DATA_PATH.joinpath('plugin_catalog.json.gz')
+SCHEMA_PATH = DATA_PATH.joinpath('plugin_catalog.schema')
+
+
+def get_catalog_hash(plugins: List[dict], compatibility: dict = None) -> str:
+    """Get the sha256 of the canonical json representation of the plugins and compatibility matrix"""
+    content = plugins if compatibility is None else [plugins, compatibility]
+    return sha256(json.dumps(content, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+
+def _get_schema() -> dict:
+    with open(SCHEMA_PATH, 'r') as f:
+        return json.load(f)
+
+
+def write_catalog(plugins: Iterable[PluginRecord], path: Union[str, Path] = CATALOG_PATH,
+                  compatibility: dict = None) -> str:
+    """Validate and write the compressed catalog
+
+    Parameters
+    ----------
+    plugins: iterable of PluginRecord
+        the latest release of each plugin
+    path: str or Path
+    compatibility: dict
+        the plugin x pymodaq series compatibility matrix as returned by validate.get_compatibility_matrix
+
+    Returns
+    -------
+    str: the content hash of the catalog
+    """
+    import jsonschema
+
+    plugins = [dict(plugin) for plugin in plugins]
+    for plugin in plugins:
+        plugin['authors'] = list(plugin['authors'])
+        plugin['contributors'] = list(plugin['contributors'])
+    catalog_hash = get_catalog_hash(plugins, compatibility)
+    catalog = {'name': CATALOG_NAME, 'format': CATALOG_FORMAT, 'sha256': catalog_hash,
+               'pymodaq-plugins': plugins}
+    if compatibility is not None:
+        catalog['compatibility'] = compatibility
+    jsonschema.validate(catalog, _get_schema())
+    buffer = io.BytesIO()
+    with gzip.GzipFile(filename='', mode='wb', fileobj=buffer, mtime=0) as gz:
+        gz.write(json.dumps(catalog, sort_keys=True, indent=0).encode())
+    content = buffer.getvalue()
+    path = Path(path)
+    if not (path.is_file() and path.read_bytes() == content):  # untouched if unchanged
+        with open(path, 'wb') as f:
+            f.write(content)
+    return catalog_hash
+
+
+def _read_catalog(path: Union[str, Path], validate=True) -> Optional[dict]:
+    if not Path(path).is_file():
+        logger.info(f'No plugin catalog in {path}')
+        return None
+    try:
+        with gzip.open(path, 'rb') as f:
+            catalog = json.loads(f.read().decode())
+        if catalog.get('format') != CATALOG_FORMAT:
+            logger.warning(f'Unsupported plugin catalog format: {catalog.get("format")}')
+            return None
+        if validate:
+            import jsonschema  # slow to import, not needed by the plugin manager at startup
+            try:
+                jsonschema.validate(catalog, _get_schema())
+            except jsonschema.ValidationError as e:
+                logger.warning(f'Could not load the plugin catalog {path}: {e.message}')
+                return None
+        if get_catalog_hash(catalog['pymodaq-plugins'], catalog.get('compatibility')) != catalog['sha256']:
+            logger.warning(f'The plugin catalog {path} is corrupted')
+            return None
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f'Could not load the plugin catalog {path}: {e}')
+        return None
+    return catalog
+
+
+def load_catalog(path: Union[str, Path] = CATALOG_PATH, validate=True,
+                 pymodaq_version: Union[str, Version] = None) -> Optional[List[PluginRecord]]:
+    """Load the compressed catalog
+
+    Parameters
+    ----------
+    path: str or Path
+    validate: bool
+        if True, check the catalog against its json schema (the content hash is always checked)
+    pymodaq_version: str or Version
+        if given, the version of each plugin is the newest one compatible with the minor series of this pymodaq
+        version according to the compatibility matrix, incompatible plugins being dropped. The catalog only holds the
+        description of the latest release: for an older release, the description and instruments are left empty
+        (the project level info, name and homepage, are kept)
+
+    Returns
+    -------
+    list of PluginRecord or None if the file is missing, of an unknown format, corrupted or if the pymodaq series is
+    not in the compatibility matrix
+    """
+    catalog = _read_catalog(path, validate=validate)
+    if catalog is None:
+        return None
+    plugins = [PluginRecord.from_dict(plugin) for plugin in catalog['pymodaq-plugins']]
+    if pymodaq_version is None:
+        return plugins
+
+    series = get_series_key(pymodaq_version)
+    compatibility = catalog.get('compatibility', dict([]))
+    if series not in compatibility.get('series', dict([])):
+        logger.info(f'The pymodaq series {series} is not in the compatibility matrix of the plugin catalog')
+        return None
+    compatible_plugins = []
+    for plugin in plugins:
+        version = compatibility['plugins'].get(plugin.plugin_name, dict([])).get(series)
+        if version is not None:
+            if version != plugin.version:
+                plugin = plugin.replace(version=version, description='', instruments=dict([]))
+            compatible_plugins.append(plugin)
+    return compatible_plugins
+
+
+def load_compatibility_matrix(path: Union[str, Path] = CATALOG_PATH) -> Optional[dict]:
+    """Load the plugin x pymodaq series compatibility matrix from the compressed catalog
+
+    Returns
+    -------
+    dict with keys:
+        series: the latest pymodaq release of each minor series
+        plugins: for each plugin name, the newest compatible release for each series
+    """
+    catalog = _read_catalog(path)
+    if catalog is not None:
+        return catalog.get('compatibility')
@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+"""
+On-disk cache of the json metadata served by the pypi server
+
+Entries are stored one file per url. Fresh entries (younger than the time to live) are served without any request,
+expired ones are revalidated using the ETag/Last-Modified headers so that unchanged packages cost a 304 response
+instead of the full json body.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from hashlib import sha256
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from pymodaq_plugin_manager import session
+from pymodaq_plugin_manager.profiling import profiler
+from pymodaq_plugin_manager.session import FetchError, get_index_url
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+
+DEFAULT_TTL = 3600.  # in seconds
+IMMUTABLE_TTL = float('inf')  # metadata of a released version never changes
+CACHE_DIR_NAME = 'plugin_manager_cache'
+SNAPSHOT_FILE_NAME = 'catalog_snapshot.json'
+DOC_ROWS_FILE_NAME = 'doc_rows.json'
+LAST_PLUGINS_FILE_NAME = 'last_plugins.json'
+ENTRY_PATTERN = '[0-9a-f]' * 64 + '.json'  # entries are named from the sha256 of their url
+
+
+def get_default_cache_dir() -> Path:
+    """Get the cache folder within the local pymodaq configuration folder of the user"""
+    from pymodaq_utils.config import get_set_config_dir
+    return get_set_config_dir(CACHE_DIR_NAME, user=True)
+
+
+def write_json_atomic(path: Path, content) -> bool:
+    """Write a json file through a temporary file so that concurrent readers never see a partial file"""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(content, f)
+        os.replace(tmp_name, path)
+        return True
+    except OSError as e:
+        logger.warning(f'Could not write {path}: {e}')
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+        return False
+
+
+class MetadataCache:
+    """Persistent cache of json responses with conditional revalidation
+
+    Parameters
+    ----------
+    path: Path
+        the folder where the entries are stored (default: the pymodaq user local folder)
+    ttl: float
+        the time (in seconds) during which an entry is served without contacting the server
+    """
+
+    def __init__(self, path: Union[str, Path] = None, ttl: float = DEFAULT_TTL):
+        self._path = Path(path) if path is not None else None
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._stats = dict(hits=0, revalidated=0, misses=0, stale=0, errors=0)
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = get_default_cache_dir()
+        self._path.mkdir(parents=True, exist_ok=True)
+        return self._path
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.path.joinpath(SNAPSHOT_FILE_NAME)
+
+    @property
+    def doc_rows_path(self) -> Path:
+        return self.path.joinpath(DOC_ROWS_FILE_NAME)
+
+    @property
+    def last_plugins_path(self) -> Path:
+        return self.path.joinpath(LAST_PLUGINS_FILE_NAME)
+
+    def stats(self) -> dict:
+        """Get the number of fresh hits, 304 revalidations, full downloads, stale entries served on error and errors"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats['entries'] = len(list(self.path.glob(ENTRY_PATTERN)))
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def clear(self):
+        """Remove all entries from the cache folder"""
+        for entry in self.path.glob(ENTRY_PATTERN):
+            try:
+                entry.unlink()
+            except OSError as e:
+                logger.warning(f'Could not remove the cache entry {entry}: {e}')
+
+    def _entry_path(self, url: str) -> Path:
+        return self.path.joinpath(f'{sha256(url.encode()).hexdigest()}.json')
+
+    def _load(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._entry_path(url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry.get('url') == url:
+                return entry
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _store(self, url: str, entry: dict):
+        write_json_atomic(self._entry_path(url), entry)
+
+    def get(self, url: str, ttl: float = None, deadline: float = None) -> Optional[dict]:
+        """Get the json content of an url, from the cache if fresh, otherwise from the server
+
+        Parameters
+        ----------
+        url: str
+        ttl: float
+            overrides the default time to live of the cache for this url, not applied above the default one to a
+            cached 404
+        deadline: float
+            absolute time (time.monotonic() based) after which the server is not contacted anymore
+
+        Returns
+        -------
+        dict: the decoded json content or None if the url doesn't exist (404)
+
+        Raises
+        ------
+        FetchError: if the server cannot give an answer and there is no expired entry to fall back to
+        """
+        ttl = self.ttl if ttl is None else ttl
+        entry = self._load(url)
+        if entry is not None and entry['content'] is None:
+            ttl = min(ttl, self.ttl)  # a 404 may be transient (mirror syncing), even for an immutable url
+        if entry is not None and time.time() - entry['fetched'] < ttl:
+            self._count('hits')
+            profiler.record_cache('cache_hits')
+            return entry['content']
+
+        import requests  # imported on the first network access, it is slow to import
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        try:
+            rep = session.get(url, headers=headers, deadline=deadline)
+        except (FetchError, requests.exceptions.RequestException) as e:
+            return self._fallback(url, entry, str(e))
+
+        if rep.status_code == 304 and entry is not None:
+            self._count('revalidated')
+            profiler.record_cache('revalidated')
+            entry['fetched'] = time.time()
+            self._store(url, entry)
+            return entry['content']
+        elif rep.status_code == 200 or rep.status_code == 404:
+            try:
+                content = rep.json() if rep.status_code == 200 else None
+            except ValueError as e:
+                return self._fallback(url, entry, f'invalid json ({e})')
+            self._count('misses')
+            self._store(url, dict(url=url, fetched=time.time(), etag=rep.headers.get('ETag'),
+                                  last_modified=rep.headers.get('Last-Modified'), content=content))
+            return content
+        else:
+            return self._fallback(url, entry, f'status code {rep.status_code}')
+
+    def _fallback(self, url: str, entry: Optional[dict], reason: str) -> Optional[dict]:
+        """Serve an expired entry (if any) when the server cannot answer properly, otherwise raise a FetchError"""
+        if entry is not None:
+            self._count('stale')
+            logger.warning(f'Could not revalidate {url} ({reason}), using the cached content')
+            return entry['content']
+        self._count('errors')
+        raise FetchError(f'Could not fetch {url} ({reason})')
+
+
+class CatalogSnapshot:
+    """Persisted result of the resolution of each plugin package together with its pypi last serial
+
+    A package whose serial didn't move since the last refresh doesn't need to be resolved again. Resolutions depend on
+    the targeted pymodaq version, so there is one section per index and targeted version, each one being invalidated
+    when a new pymodaq release is published.
+
+    Parameters
+    ----------
+    path: Path
+        the snapshot file
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._sections: Dict[str, dict] = json.load(f)
+        except (OSError, ValueError):
+            self._sections = dict([])
+
+    @staticmethod
+    def section_key(pymodaq_version) -> str:
+        """Serials are specific to an index, hence sections are also keyed by the index url"""
+        return f"{get_index_url()}|{'latest' if pymodaq_version is None else str(pymodaq_version)}"
+
+    def get_section(self, pymodaq_version, pymodaq_latest) -> Dict[str, dict]:
+        """Get the {package: {'serial': int, 'plugin': dict}} resolved for a pymodaq version"""
+        key = self.section_key(pymodaq_version)
+        with self._lock:
+            section = self._sections.get(key)
+            if section is None or section.get('pymodaq_latest') != str(pymodaq_latest):
+                section = dict(pymodaq_latest=str(pymodaq_latest), packages=dict([]))
+                self._sections[key] = section
+            return section['packages']
+
+    def lookup(self, pymodaq_version, pymodaq_latest, package: str, serial: Optional[int]):
+        """Get the previous resolution of a package if its serial is unchanged
+
+        Returns
+        -------
+        tuple: (found: bool, plugin: dict or None)
+        """
+        if serial is None:
+            return False, None
+        entry = self.get_section(pymodaq_version, pymodaq_latest).get(package)
+        if entry is not None and entry['serial'] == serial:
+            return True, entry['plugin']
+        return False, None
+
+    def update(self, pymodaq_version, pymodaq_latest, resolved: Dict[str, tuple], partial=False):
+        """Store the resolutions {package: (serial, plugin)} of a refresh, plugin being a mapping or None
+
+        Parameters
+        ----------
+        pymodaq_version: Version or str
+        pymodaq_latest: Version or str
+        resolved: dict
+        partial: bool
+            if False, the resolutions replace the content of the section. If True (interrupted refresh), they are
+            merged into it (entries being checked against the serials, older ones stay valid) and the section is marked
+            as partial
+        """
+        packages = self.get_section(pymodaq_version, pymodaq_latest)
+        with self._lock:
+            if not partial:
+                packages.clear()
+            for package, (serial, plugin) in resolved.items():
+                if serial is not None:
+                    packages[package] = dict(serial=serial, plugin=dict(plugin) if plugin is not None else None)
+            self._sections[self.section_key(pymodaq_version)]['partial'] = partial
+
+    def is_partial(self, pymodaq_version, pymodaq_latest) -> bool:
+        """Check if the section of a pymodaq version has been saved by an interrupted refresh"""
+        self.get_section(pymodaq_version, pymodaq_latest)
+        with self._lock:
+            return self._sections[self.section_key(pymodaq_version)].get('partial', False)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            write_json_atomic(self.path, self._sections)
+
+    def clear(self):
+        with self._lock:
+            self._sections = dict([])
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def save_last_plugins(path: Union[str, Path], plugins: Iterable, pymodaq_version) -> bool:
+    """Persist the plugins of the last refresh, to be displayed at the next start while a new refresh is done
+
+    Parameters
+    ----------
+    path: Path
+    plugins: iterable of PluginRecord or dict
+        the plugins available on the index (before being split into available, installed and update)
+    pymodaq_version: Version or str
+        the pymodaq version the plugins have been resolved for
+    """
+    return write_json_atomic(Path(path), dict(key=CatalogSnapshot.section_key(pymodaq_version), timestamp=time.time(),
+                                              plugins=[dict(plugin) for plugin in plugins]))
+
+
+def load_last_plugins(path: Union[str, Path], pymodaq_version) -> Optional[Tuple[List[dict], float]]:
+    """Load the plugins saved by save_last_plugins
+
+    Returns
+    -------
+    tuple: (list of plugin dict, time of the refresh as a timestamp) or None if missing or saved for another index or
+    pymodaq version
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = json.load(f)
+        if content['key'] == CatalogSnapshot.section_key(pymodaq_version):
+            return content['plugins'], content['timestamp']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+metadata_cache = MetadataCache()
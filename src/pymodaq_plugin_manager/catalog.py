@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+"""
+Catalog of the plugins indexed by their normalized distribution name
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from packaging.utils import canonicalize_name
+from packaging.version import InvalidVersion, Version, parse
+
+AVAILABLE = 'available'  # install status of a plugin not installed
+INSTALLED = 'installed'  # install status of an installed plugin, up to date
+UPDATE = 'update'  # install status of an installed plugin with a newer compatible version
+
+
+def normalize_name(name: str) -> str:
+    """Normalize a distribution name following PEP 503 (pymodaq_plugins_Mock and pymodaq-plugins-mock are the same)"""
+    return canonicalize_name(name)
+
+
+class PluginRecord:
+    """Compact and immutable info on a plugin, shared between the available, installed and update views
+
+    Attributes are readable with the keys of the historical plugin dict (plugin['display-name']), and records iterate,
+    copy and pickle like them, for backwards compatibility. The version is parsed once for all comparisons.
+    """
+    KEYS = ('plugin-name', 'display-name', 'version', 'id', 'repository', 'description', 'instruments', 'authors',
+            'contributors', 'homepage')
+    __slots__ = tuple(key.replace('-', '_') for key in KEYS) + ('parsed_version',)
+
+    def __init__(self, plugin_name: str, display_name: str = '', version: str = '', id: str = '', repository: str = '',
+                 description: str = '', instruments: Union[str, dict] = '', authors: Iterable[str] = (),
+                 contributors: Iterable[str] = (), homepage: str = ''):
+        values = dict(plugin_name=plugin_name, display_name=display_name, version=version, id=id,
+                      repository=repository, description=description, instruments=instruments,
+                      authors=tuple(authors), contributors=tuple(contributors), homepage=homepage)
+        for attribute, value in values.items():
+            object.__setattr__(self, attribute, value)
+        try:
+            parsed_version = Version(version)
+        except (InvalidVersion, TypeError):
+            parsed_version = None
+        object.__setattr__(self, 'parsed_version', parsed_version)
+
+    @classmethod
+    def from_dict(cls, plugin: dict) -> 'PluginRecord':
+        return cls(**{key.replace('-', '_'): plugin[key] for key in cls.KEYS if key in plugin})
+
+    def to_dict(self) -> dict:
+        return {key: self[key] for key in self.KEYS}
+
+    def replace(self, **changes) -> 'PluginRecord':
+        """Get a new record with some attributes changed (the other values are shared, not copied)"""
+        values = {key.replace('-', '_'): self[key] for key in self.KEYS}
+        values.update(changes)
+        return PluginRecord(**values)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __getitem__(self, key: str):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key.replace('-', '_'))
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def keys(self):
+        return self.KEYS
+
+    def values(self) -> List:
+        return [self[key] for key in self.KEYS]
+
+    def items(self) -> List[Tuple[str, object]]:
+        return [(key, self[key]) for key in self.KEYS]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.KEYS
+
+    def __reduce__(self):
+        # the slots can't be restored through __setattr__, the record is built again (copy, deepcopy and pickle)
+        return self.__class__, tuple(self.values())
+
+    def __eq__(self, other):
+        if not isinstance(other, PluginRecord):
+            return NotImplemented
+        return all(self[key] == other[key] for key in self.KEYS)
+
+    __hash__ = None  # instruments may be a dict
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.plugin_name!r}, {self.version!r})'
+
+
+PluginLike = Union[PluginRecord, dict]
+
+
+def get_install_status(plugin: PluginRecord, installed_version: Optional[str]) -> str:
+    """Get the install status (AVAILABLE, INSTALLED or UPDATE) of a plugin given its installed version, None if it is
+    not installed"""
+    if installed_version is None:
+        return AVAILABLE
+    if plugin.parsed_version is not None and plugin.parsed_version > parse(installed_version):
+        return UPDATE
+    return INSTALLED
+
+
+class PluginCatalog:
+    """Plugins info (as returned by get_pypi_plugins) with O(1) lookup by name
+
+    Parameters
+    ----------
+    plugins: iterable of PluginRecord or dict
+        the plugins info, the order of insertion is kept
+    """
+
+    def __init__(self, plugins: Iterable[PluginLike] = ()):
+        self._plugins: Dict[str, PluginRecord] = dict([])
+        for plugin in plugins:
+            self.add(plugin)
+
+    def add(self, plugin: PluginLike):
+        """Add or replace a plugin"""
+        if not isinstance(plugin, PluginRecord):
+            plugin = PluginRecord.from_dict(plugin)
+        self._plugins[normalize_name(plugin.plugin_name)] = plugin
+
+    def get(self, name: str, default=None) -> Optional[PluginRecord]:
+        return self._plugins.get(normalize_name(name), default)
+
+    def __getitem__(self, name: str) -> PluginRecord:
+        return self._plugins[normalize_name(name)]
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self._plugins
+
+    def __len__(self) -> int:
+        return len(self._plugins)
+
+    def __iter__(self) -> Iterator[PluginRecord]:
+        return iter(self._plugins.values())
+
+    def partition(self, installed: Dict[str, str]) -> Tuple[List[PluginRecord], List[PluginRecord],
+                                                            List[PluginRecord]]:
+        """Sort plugins into the available, installed and updatable ones in a single pass
+
+        Parameters
+        ----------
+        installed: dict
+            the installed plugin names and versions as returned by get_installed_plugins
+
+        Returns
+        -------
+        plugins_available: list of available plugins for installation
+        plugins_installed: list of already installed plugins (with their installed name and version)
+        plugins_update: list of plugins with existing update (with the version available on pypi)
+        """
+        installed = {normalize_name(name): (name, version) for name, version in installed.items()}
+        plugins_available = []
+        plugins_installed = []
+        plugins_update = []
+        for key, plugin in self._plugins.items():
+            if key in installed:
+                name, version = installed[key]
+                plugins_installed.append(plugin.replace(plugin_name=name, version=version))
+                if get_install_status(plugin, version) == UPDATE:
+                    plugins_update.append(plugin)
+            else:
+                plugins_available.append(plugin)
+        return plugins_available, plugins_installed, plugins_update
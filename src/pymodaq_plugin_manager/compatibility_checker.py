@@ -11,6 +11,7 @@ import pkgutil
 from pymodaq_data import Q_, Unit
 
 from pymodaq_plugin_manager.validate import  get_pypi_plugins
+from pymodaq_plugin_manager.artifact import load_compatibility_matrix
 
 
 def _detect_encoding(filename):
@@ -195,6 +196,7 @@ def parse_args():
     parser = argparse.ArgumentParser(description="Detect incompatibilities between a PyMoDAQ version and the released plugins")
     parser.add_argument("-r", type=Path, default=Path("reports/"), dest="reports_path", help="Path to the reports folder (default: reports/)")
     parser.add_argument("-p", type=str, default=None, dest="plugin", help="plugin to check (instead of the complete list)")
+    parser.add_argument("-s", type=str, default=None, dest="series", help="PyMoDAQ minor series (e.g. 4.4): check the newest plugin releases compatible with it according to the compatibility matrix of the plugin catalog")
     parser.add_argument(nargs="?", type=str, default="", dest="pymodaq", help="Installation source of the PyMoDAQ package (default: empty string)")
     return parser.parse_args()
 
@@ -217,6 +219,13 @@ def main():
 
     if args.plugin:
         plugin_list = [{"plugin-name" : args.plugin, "version" : None}]
+    elif args.series:
+        matrix = load_compatibility_matrix()
+        if matrix is None or args.series not in matrix['series']:
+            print(f'The PyMoDAQ series {args.series} is not in the compatibility matrix of the plugin catalog')
+            sys.exit(1)
+        plugin_list = [{"plugin-name": name, "version": versions[args.series]}
+                       for name, versions in matrix['plugins'].items() if args.series in versions]
     else:
         plugin_list = get_pypi_plugins()
 
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Index of the installed distributions built in a single scan of sys.path
+
+The index is cached and rebuilt only when the modification time of one of the sys.path folders changed (installing,
+updating or removing a distribution adds or removes a .dist-info folder) or when sys.path itself changed.
+"""
+import importlib
+import os
+import sys
+import threading
+from importlib import metadata
+from typing import Dict, List, Optional, Tuple
+
+from pymodaq_plugin_manager.catalog import normalize_name
+
+
+class InstalledIndex:
+    """Names, versions and entry points of the installed distributions
+
+    Attributes
+    ----------
+    versions: dict
+        normalized distribution name as keys, (name, version) as values
+    entry_points: dict
+        entry point group as keys, list of (entry point, distribution version) as values
+    """
+
+    def __init__(self):
+        self.versions: Dict[str, Tuple[str, str]] = dict([])
+        self.entry_points: Dict[str, List[Tuple[metadata.EntryPoint, str]]] = dict([])
+        for dist in metadata.distributions():
+            name = dist.metadata['Name']
+            if name is None:
+                continue
+            key = normalize_name(name)
+            if key in self.versions:  # the first one on sys.path is the one imported
+                continue
+            self.versions[key] = (name, dist.version)
+            for entry in dist.entry_points:
+                self.entry_points.setdefault(entry.group, []).append((entry, dist.version))
+
+    def get_version(self, name: str, default: str = None) -> Optional[str]:
+        """Get the version of an installed distribution, default if it is not installed"""
+        name_version = self.versions.get(normalize_name(name))
+        return default if name_version is None else name_version[1]
+
+    def get_entrypoints(self, group: str) -> List[metadata.EntryPoint]:
+        return [entry for entry, _ in self.entry_points.get(group, [])]
+
+
+_cache = dict(signature=None, index=None)
+_lock = threading.Lock()
+
+
+def _get_paths_signature() -> tuple:
+    signature = []
+    for path in sys.path:
+        try:
+            signature.append((path, os.stat(path or '.').st_mtime_ns))
+        except OSError:
+            signature.append((path, None))
+    return tuple(signature)
+
+
+def get_installed_index(force=False) -> InstalledIndex:
+    """Get the index of the installed distributions, rebuilt only if the environment changed"""
+    signature = _get_paths_signature()
+    with _lock:
+        if force or _cache['index'] is None or _cache['signature'] != signature:
+            _cache['index'] = InstalledIndex()
+            _cache['signature'] = signature
+        return _cache['index']
+
+
+def invalidate_installed_index():
+    """Force a new scan at the next call, to be used after installing or removing packages"""
+    with _lock:
+        _cache['index'] = None
+    importlib.invalidate_caches()
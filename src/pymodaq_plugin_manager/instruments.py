@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Extraction of the instruments listed in the description (README) of a plugin
+
+Plugin READMEs list their instruments in sections named after the plugin types, for instance::
+
+    Actuators
+    +++++++++
+
+    * **Mock**: Mock actuator
+
+The description is parsed in a single pass and the result memoized per description (keyed by its hash), so that the
+README generator and the instrument filter of the plugin manager share the same parsed data, whatever the record
+(package, release or installed version) the description comes from.
+"""
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+from pymodaq_plugin_manager.catalog import PluginLike
+
+INSTRUMENT_TYPES = ('Actuators', 'Viewer0D', 'Viewer1D', 'Viewer2D', 'ViewerND')
+BULLET = '* **'
+UNDERLINE_CHARS = set('=-~+^"\'`#*:._')
+
+_cache: Dict[str, Dict[str, List[str]]] = dict([])
+_lock = threading.Lock()
+
+
+def _is_underline(line: str) -> bool:
+    line = line.strip()
+    return len(line) >= 3 and len(set(line)) == 1 and line[0] in UNDERLINE_CHARS
+
+
+def parse_instruments(description: str) -> Dict[str, List[str]]:
+    """Get the instruments listed in a plugin description
+
+    A line (other than a bullet) containing a plugin type name starts the list of this type, each following
+    '* **Name**: comment' bullet being one of its instruments. The list ends at the next plugin type or at the next
+    section title.
+
+    Parameters
+    ----------
+    description: str
+        the description (reStructuredText or markdown) of the plugin
+
+    Returns
+    -------
+    dict: plugin types as keys (in the order of INSTRUMENT_TYPES, types without instruments are missing) and the list
+    of the instrument bullets (without the leading '* ') as values
+    """
+    found = dict([])
+    current = None
+    lines = description.splitlines() if description else []
+    for ind, line in enumerate(lines):
+        if line.startswith(BULLET):
+            if current is not None:
+                found[current].append(line[2:].rstrip())
+            continue
+        instrument_type = next((head for head in INSTRUMENT_TYPES if head in line), None)
+        if instrument_type is not None:
+            current = instrument_type
+            found.setdefault(current, [])
+        elif current is not None and ind + 1 < len(lines) and line.strip() and _is_underline(lines[ind + 1]):
+            current = None  # another section title
+    return {head: found[head] for head in INSTRUMENT_TYPES if len(found.get(head, [])) != 0}
+
+
+def _description_key(description: Optional[str]) -> str:
+    return hashlib.sha1((description or '').encode('utf-8')).hexdigest()
+
+
+def get_instruments(description: Optional[str]) -> Dict[str, List[str]]:
+    """Get the instruments listed in a plugin description, memoized on the hash of the description
+
+    The returned dict is shared between callers and must not be modified
+    """
+    key = _description_key(description)
+    with _lock:
+        instruments = _cache.get(key)
+    if instruments is None:
+        instruments = parse_instruments(description)
+        with _lock:
+            instruments = _cache.setdefault(key, instruments)
+    return instruments
+
+
+def get_plugin_instruments(plugin: PluginLike) -> Dict[str, List[str]]:
+    """Get the instruments of a plugin, from its record if already parsed or from its description"""
+    instruments = plugin['instruments']
+    if isinstance(instruments, dict) and len(instruments) != 0:
+        return instruments
+    return get_instruments(plugin['description'])
+
+
+def clear_instruments_cache():
+    with _lock:
+        _cache.clear()
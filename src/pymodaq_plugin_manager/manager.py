@@ -1,38 +1,200 @@
+import argparse
 import logging
 from packaging import version as version_mod
 import sys
 import subprocess
-
-import numpy as np
-from qtpy import QtWidgets, QtCore
-from qtpy.QtCore import Qt, Signal
-from qtpy.QtGui import QTextCursor
-from readme_renderer.rst import render
-
-from pymodaq_plugin_manager.validate import get_plugins
-from pymodaq_utils.packages import get_package_metadata
+import time
+from typing import Dict, Iterable, List
+
+from qtpy import QtWidgets, QtCore, QtGui
+from qtpy.QtCore import Qt, Signal, QModelIndex
+
+from pymodaq_plugin_manager.validate import iter_pypi_plugins, get_installed_plugins
+from pymodaq_plugin_manager.artifact import load_catalog
+from pymodaq_plugin_manager.cache import metadata_cache, load_last_plugins, save_last_plugins
+from pymodaq_plugin_manager.catalog import (PluginRecord, normalize_name, get_install_status, AVAILABLE, INSTALLED,
+                                            UPDATE)
+from pymodaq_plugin_manager.installed import get_installed_index, invalidate_installed_index
+from pymodaq_plugin_manager.profiling import profiler, add_profile_argument
+from pymodaq_plugin_manager.session import FetchError
+from pymodaq_plugin_manager.rendering import RenderCache, DescriptionPrerenderer
+from pymodaq_plugin_manager.search import SearchIndex
+from pymodaq_plugin_manager.pypi import get_package_metadata
 from pymodaq_plugin_manager import __version__ as version
-from pymodaq_plugin_manager.utils import QVariant, TableModel, TableView, SpinBoxDelegate, get_pymodaq_version
+from pymodaq_plugin_manager.utils import (QVariant, TableModel, TableView, SpinBoxDelegate, LogSink,
+                                          get_pymodaq_version)
 
 logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
 
+FETCH_TIMEOUT = 120.  # in seconds, plugins not fetched within this delay are reported as failed
+SEARCH_DELAY = 150  # in ms, the filter is applied once the search text didn't change for this delay
+PRERENDER_MARGIN = 20  # number of rows above and below the visible ones whose description is rendered in advance
+PRERENDER_DELAY = 200  # in ms, rows are pre-rendered once the view didn't scroll for this delay
+LOG_MAX_LINES = 5000  # lines kept in the info pane
+CANCEL_DELAY = 5000  # in ms, a cancelled pip process is killed if it didn't terminate within this delay
+VERSION_CHECK_TIMEOUT = 5.  # in seconds, the version check blocking the window
+FAILED_EXIT_CODE = -1  # reported for a pip process that couldn't start or crashed
+THREAD_STOP_TIMEOUT = 5000  # in ms, maximum time waited for each background thread when closing the manager
+
+HEADER = ('Plugin', 'Version', 'Installed', 'Status')
+STATUS_LABELS = {AVAILABLE: 'Available', INSTALLED: 'Installed', UPDATE: 'Update available'}
+VIEWS = {'Available': ('install', (AVAILABLE,)),  # view name: (pip action, install status of the displayed plugins)
+         'Update': ('update', (UPDATE,)),
+         'Installed': ('remove', (INSTALLED, UPDATE))}
+
 
 class TableModel(TableModel):
-    """Specific Model to display plugins info in a TableView"""
-    def __init__(self, *args, plugins=[], **kwargs):
-        super().__init__(*args, **kwargs)
-        self._selected = [False for ind in range(len(self._data))]
-        self.plugins = plugins
+    """Specific Model to display plugins info in a TableView
+
+    A single model holds every plugin with its install status, the available, update and installed views being
+    FilterProxy on it, so that a refresh only updates the rows that changed
+
+    Rows are inserted (insert_rows_data, reset_data, insert_data...) as PluginRecord, the displayed data, install
+    status and selection being derived from them. The search index and the rows of the plugin names are extended when
+    plugins are appended and rebuilt on demand after other changes.
+
+    Parameters
+    ----------
+    plugins: list of PluginRecord
+        the plugins available on pypi
+    installed: dict
+        the installed plugin names and versions as returned by get_installed_plugins
+    stale: set of str
+        normalized names of the plugins with outdated info, shared with the PluginManager
+    """
+    def __init__(self, plugins: List[PluginRecord] = (), installed: Dict[str, str] = None, stale=None, parent=None):
+        super().__init__([], header=list(HEADER), editable=[False for _ in HEADER], parent=parent)
+        self._selected = []
+        self.plugins: List[PluginRecord] = []
+        self.installed = {normalize_name(name): version  # normalized names: installed versions
+                          for name, version in (installed or dict([])).items()}
+        self._status = []
+        self.stale = set([]) if stale is None else stale  # normalized names of the plugins with outdated info
+        self._rows = dict([])  # normalized names: rows, None if to be rebuilt
+        self._search_index = SearchIndex()  # None if to be rebuilt
+        self._insert_rows_data(0, plugins)
+
+    @staticmethod
+    def get_row_data(plugin: PluginRecord, installed: Dict[str, str], status: str) -> list:
+        return [plugin['display-name'], plugin['version'], installed.get(normalize_name(plugin['plugin-name']), ''),
+                STATUS_LABELS[status]]
+
+    def get_status(self, row: int) -> str:
+        """Get the install status (AVAILABLE, INSTALLED or UPDATE) of the plugin of a row"""
+        return self._status[row]
+
+    def _update_row(self, row: int, plugin: PluginRecord) -> bool:
+        """Update the stored data of a row, return True if it changed
+
+        The row is unchecked if its install status changed, the row moving to another view where it wasn't selected
+        """
+        status = get_install_status(plugin, self.installed.get(normalize_name(plugin['plugin-name'])))
+        data = self.get_row_data(plugin, self.installed, status)
+        if status != self._status[row]:
+            self._selected[row] = False
+        changed = status != self._status[row] or data != self._data[row]
+        self._status[row] = status
+        self._data[row] = data
+        return changed
+
+    def set_installed(self, installed: Dict[str, str]):
+        """Set the installed plugins (as returned by get_installed_plugins), only the rows whose install status
+        changed being updated"""
+        self.installed = {normalize_name(name): version for name, version in installed.items()}
+        for row, plugin in enumerate(self.plugins):
+            if self._update_row(row, plugin):
+                self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount(QModelIndex()) - 1))
+
+    def is_stale(self, row: int) -> bool:
+        return normalize_name(self.plugins[row]['plugin-name']) in self.stale
+
+    @property
+    def search_index(self) -> SearchIndex:
+        if self._search_index is None:
+            self._search_index = SearchIndex(self.plugins)
+        return self._search_index
+
+    def find_plugin(self, name: str) -> int:
+        """Get the row of a plugin from its name, -1 if not in the model"""
+        if self._rows is None:
+            self._rows = {normalize_name(plugin['plugin-name']): row for row, plugin in enumerate(self.plugins)}
+        return self._rows.get(normalize_name(name), -1)
+
+    def get_data_all(self) -> List[PluginRecord]:
+        return list(self.plugins)
+
+    def set_data_all(self, plugins: Iterable[PluginRecord]):
+        self.reset_data(list(plugins))
 
     @property
     def selected(self):
         return self._selected
 
+    def columnCount(self, parent):
+        return len(self.header)
+
+    def append_plugin(self, plugin: PluginRecord):
+        """Add a row at the end of the model for a newly fetched plugin"""
+        self.insert_rows_data(len(self.plugins), [plugin])
+
+    def set_plugin(self, plugin: PluginRecord):
+        """Update the row of a plugin with refreshed info, adding it at the end if not in the model"""
+        row = self.find_plugin(plugin['plugin-name'])
+        if row < 0:
+            self.append_plugin(plugin)
+            return
+        if plugin != self.plugins[row]:
+            self.plugins[row] = plugin
+            self.search_index.set(row, plugin)
+            self._update_row(row, plugin)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount(QModelIndex()) - 1))
+
+    def remove_plugins(self, names: Iterable[str]):
+        """Remove the rows of the given plugins, with a single pair of signals per contiguous range of rows"""
+        rows = set([self.find_plugin(name) for name in names]) - {-1}
+        if len(rows) != 0:
+            self.remove_rows(rows)
+
+    def _insert_rows_data(self, row, plugins):
+        plugins = list(plugins)
+        status = [get_install_status(plugin, self.installed.get(normalize_name(plugin['plugin-name'])))
+                  for plugin in plugins]
+        super()._insert_rows_data(row, [self.get_row_data(plugin, self.installed, plugin_status)
+                                        for plugin, plugin_status in zip(plugins, status)])
+        appended = row == len(self.plugins)
+        self._selected[row:row] = [False for _ in plugins]
+        self.plugins[row:row] = plugins
+        self._status[row:row] = status
+        if appended:
+            for ind, plugin in enumerate(plugins):
+                if self._rows is not None:
+                    self._rows[normalize_name(plugin['plugin-name'])] = row + ind
+                if self._search_index is not None:
+                    self._search_index.add(plugin)
+        else:  # rows shifted
+            self._rows = None
+            self._search_index = None
+
+    def _remove_rows_data(self, row, count):
+        super()._remove_rows_data(row, count)
+        del self._selected[row:row + count]
+        del self.plugins[row:row + count]
+        del self._status[row:row + count]
+        if count > 0:  # rows shifted
+            self._rows = None
+            self._search_index = None
+
+    def dropMimeData(self, data, action, row, column, parent):
+        return False  # rows are plugins, not cell values
+
     def flags(self, index):
         f = super().flags(index)
         if index.column() == 0:
-            f |= Qt.ItemFlag.ItemIsUserCheckable            
+            if index.isValid() and self.is_stale(index.row()):  # no action until refreshed
+                f &= ~Qt.ItemFlag.ItemIsUserCheckable
+            else:
+                f |= Qt.ItemFlag.ItemIsUserCheckable
         return f
 
     def data(self, index, role=Qt.ItemDataRole.DisplayRole):
@@ -43,6 +205,10 @@ class TableModel(TableModel):
                 else:
                     dat = self._data[index.row()][index.column()]
                 return dat
+            elif role == Qt.ItemDataRole.ForegroundRole and self.is_stale(index.row()):
+                return QtGui.QColor(Qt.GlobalColor.gray)
+            elif role == Qt.ItemDataRole.ToolTipRole and self.is_stale(index.row()):
+                return 'Being refreshed, from the last plugin list'
             elif role == Qt.ItemDataRole.CheckStateRole:
                 if index.column() == 0:
                     if self._selected[index.row()]:
@@ -74,31 +240,64 @@ class TableModel(TableModel):
 
 
 class FilterProxy(QtCore.QSortFilterProxyModel):
-    """Utility to filter the View"""
-    def __init__(self, parent=None):
+    """Utility to filter the View
+
+    The rows matching the search text are computed once, from the search index of the source model, each time the
+    filter changes, filterAcceptsRow being then a set lookup. Rows indexed again since (appended or updated) are
+    matched directly, and the search is done again if the index has been rebuilt (rows removed, shifting the others)
+
+    Parameters
+    ----------
+    parent: QObject
+    statuses: tuple of str
+        the install status of the displayed plugins, all plugins are displayed if None
+    """
+    def __init__(self, parent=None, statuses=None):
         super().__init__(parent)
+        self.statuses = statuses
         self.text = ''
+        self._fields = ()
+        self._accepted = set([])
+        self._search_index = None  # the index the accepted rows were searched in
+        self._revision = 0  # and its revision at that time
 
-    def filterAcceptsRow(self, sourcerow, parent_index):
-        plugin_index = self.sourceModel().index(sourcerow, 0, parent_index)
+    def search_fields(self) -> tuple:
         parent = self.parent()
-        try:
-            plugin = self.sourceModel().plugins[plugin_index.row()]
-            match = self.text == ''
-            if not (match or not plugin):
-                if hasattr(parent, "filter_name_cb") and parent.filter_name_cb.isChecked():
-                    match = match or self.text in plugin['plugin-name'].lower()
-                    match = match or self.text in plugin['display-name'].lower()
-                if hasattr(parent, "filter_description_cb") and parent.filter_description_cb.isChecked():
-                    match = match or self.text in plugin['description'].lower()
-                if hasattr(parent, "filter_instrument_cb") and parent.filter_instrument_cb.isChecked():                        
-                    for plug in plugin['instruments']:
-                        match = match | any(self.text in p.lower() for p in plugin['instruments'][plug])
-            return match
+        fields = []
+        if hasattr(parent, "filter_name_cb") and parent.filter_name_cb.isChecked():
+            fields.append('name')
+        if hasattr(parent, "filter_description_cb") and parent.filter_description_cb.isChecked():
+            fields.append('description')
+        if hasattr(parent, "filter_instrument_cb") and parent.filter_instrument_cb.isChecked():
+            fields.append('instruments')
+        return tuple(fields)
+
+    def is_outdated(self, text: str) -> bool:
+        """Check if the filter has been computed for another search text or other search fields"""
+        return self.text != text.lower() or self._fields != self.search_fields()
 
-        except Exception as e:
-            print(e)
+    def filterAcceptsRow(self, sourcerow, parent_index):
+        if self.statuses is not None and self.sourceModel().get_status(sourcerow) not in self.statuses:
+            return False
+        if self.text == '':
             return True
+        search_index = self.sourceModel().search_index
+        if search_index is not self._search_index:
+            self._search(search_index)
+        if search_index.get_revision(sourcerow) > self._revision:  # row appended or updated since the search
+            return search_index.match(sourcerow, self.text, self._fields)
+        return sourcerow in self._accepted
+
+    def _search(self, search_index: SearchIndex):
+        self._accepted = search_index.search(self.text, self._fields)
+        self._search_index = search_index
+        self._revision = search_index.revision
+
+    def invalidateFilter(self):
+        self._fields = self.search_fields()
+        if self.text != '' and self.sourceModel() is not None:
+            self._search(self.sourceModel().search_index)
+        super().invalidateFilter()
 
     def setTextFilter(self, regexp: str):
         self.text = regexp.lower()
@@ -106,17 +305,107 @@ class FilterProxy(QtCore.QSortFilterProxyModel):
 
 
 class PluginFetcher(QtCore.QObject):
+    """Fetch plugins from pypi and emit them (as PluginRecord) as soon as resolved"""
 
-    plugins_signal = QtCore.Signal(tuple)
+    plugin_signal = QtCore.Signal(object)
     print_signal = QtCore.Signal(str)
+    finished_signal = QtCore.Signal()
 
-    def __init__(self):
+    def __init__(self, pymodaq_version=None, last_plugins=()):
         super().__init__()
+        self.pymodaq_version = pymodaq_version
+        self.last_plugins = list(last_plugins)  # saved again for the packages that couldn't be fetched
+        self.failed = dict([])
+        self.complete = False
+        self.stopped = False
+
+    def stop(self):
+        """Stop fetching once the plugin being resolved is emitted, called from another thread"""
+        self.stopped = True
 
     def fetch_plugins(self):
-        plugins = get_plugins(False, pymodaq_version=get_pymodaq_version(),
-                              print_method=self.print_signal.emit)
-        self.plugins_signal.emit(plugins)
+        plugins = []
+        self.failed = dict([])
+        self.complete = False
+        try:
+            for plugin in iter_pypi_plugins(pymodaq_version=self.pymodaq_version, print_method=self.print_signal.emit,
+                                            timeout=FETCH_TIMEOUT, failed=self.failed):
+                if self.stopped:
+                    break
+                plugins.append(plugin)
+                self.plugin_signal.emit(plugin)
+            else:
+                self.complete = True
+                failed = set([normalize_name(name) for name in self.failed])
+                plugins.extend([PluginRecord.from_dict(plugin) for plugin in self.last_plugins
+                                if normalize_name(plugin['plugin-name']) in failed])
+                save_last_plugins(metadata_cache.last_plugins_path, plugins, self.pymodaq_version)
+        except FetchError as e:
+            self.print_signal.emit(f'Could not refresh the plugin list: {e}')
+        self.finished_signal.emit()
+
+
+class PipJob(QtCore.QObject):
+    """Run a pip command in a QProcess, streaming its output through signals without blocking the event loop
+
+    Parameters
+    ----------
+    command: list of str
+        the full command, the first element being the executable
+    """
+
+    output_signal = QtCore.Signal(str)
+    finished_signal = QtCore.Signal(int, bool, float)  # exit code, cancelled, duration in seconds
+
+    def __init__(self, command: List[str], parent=None):
+        super().__init__(parent)
+        self.command = command
+        self.cancelled = False
+        self._start = None
+        self.process = QtCore.QProcess(self)
+        environment = QtCore.QProcessEnvironment.systemEnvironment()
+        environment.insert('PYTHONUNBUFFERED', '1')
+        environment.insert('PYTHONIOENCODING', 'utf-8')
+        self.process.setProcessEnvironment(environment)
+        self.process.readyReadStandardOutput.connect(
+            lambda: self._emit_output(self.process.readAllStandardOutput()))
+        self.process.readyReadStandardError.connect(
+            lambda: self._emit_output(self.process.readAllStandardError()))
+        self.process.finished.connect(self._finished)
+        self.process.errorOccurred.connect(self._error)
+
+    def start(self):
+        self._start = time.perf_counter()
+        self.process.start(self.command[0], self.command[1:])
+
+    def is_running(self) -> bool:
+        return self.process.state() != QtCore.QProcess.ProcessState.NotRunning
+
+    def cancel(self):
+        """Terminate the process, killing it if it is still running after a few seconds"""
+        if self.is_running():
+            self.cancelled = True
+            self.process.terminate()
+            QtCore.QTimer.singleShot(CANCEL_DELAY, self._kill)
+
+    def _kill(self):
+        if self.is_running():
+            self.process.kill()
+
+    def _emit_output(self, data: QtCore.QByteArray):
+        text = bytes(data).decode('utf-8', errors='replace').rstrip()
+        if text != '':
+            self.output_signal.emit(text)
+
+    def _finished(self, exit_code: int, exit_status):
+        if exit_status == QtCore.QProcess.ExitStatus.CrashExit:  # the exit code is meaningless, it may even be 0
+            exit_code = FAILED_EXIT_CODE
+        self.finished_signal.emit(exit_code, self.cancelled, time.perf_counter() - self._start)
+
+    def _error(self, error):
+        if error == QtCore.QProcess.ProcessError.FailedToStart:
+            self.output_signal.emit(f'Could not start {self.command[0]}: {self.process.errorString()}')
+            self.finished_signal.emit(FAILED_EXIT_CODE, False, 0.)
 
 
 class PluginManager(QtCore.QObject):
@@ -126,40 +415,78 @@ class PluginManager(QtCore.QObject):
     """
     quit_signal = Signal()
     restart_signal = Signal()
+    prerender_signal = Signal(list)
 
     def __init__(self, parent, standalone=False):
         super().__init__()
 
-        self.model_available: TableModel = None
-        self.model_update: TableModel = None
-        self.model_installed: TableModel = None
+        self.model: TableModel = None
+        self.proxies: Dict[str, FilterProxy] = dict([])  # one per view, all on self.model
+        self.table_views: Dict[str, TableView] = dict([])  # one per view, keeping its own scroll and selection
 
-        self.plugins_available: list = None
-        self.plugins_installed: list = None
-        self.plugins_update: list = None
+        self.job: PipJob = None
+        self.stale_plugins = set([])  # normalized names of the plugins displayed from the last refresh
+        self._refreshed = set([])  # normalized names of the plugins refreshed by the running fetch
 
         self.parent = parent
         self.parent.setLayout(QtWidgets.QVBoxLayout())
         self.standalone = standalone
 
+        self.render_cache = RenderCache()
+        self.render_thread = QtCore.QThread()
+        prerenderer = DescriptionPrerenderer(self.render_cache)
+        prerenderer.moveToThread(self.render_thread)
+        self.render_thread.prerenderer = prerenderer
+        self.prerender_signal.connect(prerenderer.prerender)
+        self.render_thread.start()
+
         self.setup_UI()
-        self.enable_ui(False)
+        last_plugins = self.load_last_plugins()
+        self.setup_models([PluginRecord.from_dict(plugin) for plugin in last_plugins], get_installed_plugins())
 
         self.plugin_thread = QtCore.QThread()
-        plugin_fetcher = PluginFetcher()
-        plugin_fetcher.plugins_signal.connect(self.setup_models)
+        plugin_fetcher = PluginFetcher(last_plugins=last_plugins)
+        plugin_fetcher.plugin_signal.connect(self.set_plugin)
         plugin_fetcher.print_signal.connect(self.print_info)
+        plugin_fetcher.finished_signal.connect(self.fetch_finished)
         plugin_fetcher.moveToThread(self.plugin_thread)
         self.plugin_thread.plugin_fetcher = plugin_fetcher
         self.plugin_thread.started.connect(plugin_fetcher.fetch_plugins)
 
+        QtCore.QTimer.singleShot(0, self.start_fetching)
+
+    def load_last_plugins(self) -> List[dict]:
+        """Get the plugins of the last refresh, or at the first start the ones of the catalog shipped with the
+        package, displayed as stale until refreshed"""
+        pymodaq_version = get_installed_index().get_version('pymodaq')
+        pymodaq_version = version_mod.parse(pymodaq_version) if pymodaq_version is not None else None
+        last = load_last_plugins(metadata_cache.last_plugins_path, pymodaq_version)
+        if last is None:
+            catalog = load_catalog(validate=False, pymodaq_version=pymodaq_version)
+            last = ([plugin.to_dict() for plugin in catalog], None) if catalog is not None else ([], None)
+        plugins, timestamp = last
+        self.stale_plugins.update([normalize_name(plugin['plugin-name']) for plugin in plugins])
+        self.set_refresh_time(timestamp, refreshing=True)
+        return plugins
+
+    def set_refresh_time(self, timestamp: float = None, refreshing=False):
+        refreshed = 'never' if timestamp is None else time.strftime('%Y-%m-%d %H:%M', time.localtime(timestamp))
+        self.refresh_label.setText(f'Last refreshed: {refreshed}{" (refreshing...)" if refreshing else ""}')
+
+    def start_fetching(self):
+        """Get the pymodaq version (importing pymodaq is slow) once the window is displayed, then fetch the plugins
+        in the background"""
+        pymodaq_version = get_pymodaq_version()
+        self.pymodaq_version_label.setText(f'PyMoDAQ Version: {pymodaq_version}')
+        self.plugin_thread.plugin_fetcher.pymodaq_version = pymodaq_version
         self.plugin_thread.start()
 
     def check_version(self, show=True):
         try:
             current_version = version_mod.parse(version)
 
-            latest = get_package_metadata('pymodaq_plugin_manager')
+            latest = get_package_metadata('pymodaq_plugin_manager', ttl=0,
+                                          deadline=time.monotonic() + VERSION_CHECK_TIMEOUT)
             available_versions = list(latest['releases'].keys())[::-1]
 
             msgBox = QtWidgets.QMessageBox()
@@ -184,11 +511,22 @@ class PluginManager(QtCore.QObject):
         except Exception as e:
             logger.exception("Error while checking the available PyMoDAQ version")
 
+    def stop_threads(self):
+        """Stop the fetching and pre-rendering threads and wait for them to finish, so that they are not destroyed
+        while running"""
+        self.plugin_thread.plugin_fetcher.stop()
+        for thread in (self.plugin_thread, self.render_thread):
+            thread.quit()
+            if not thread.wait(THREAD_STOP_TIMEOUT):
+                logger.warning('A background thread of the plugin manager did not stop in time')
+
     def quit(self):
+        self.stop_threads()
         self.parent.parent().close()
         self.quit_signal.emit()
 
     def restart(self):
+        self.stop_threads()
         self.parent.parent().close()
         if self.standalone:
             subprocess.call([sys.executable, __file__])
@@ -213,6 +551,11 @@ class PluginManager(QtCore.QObject):
 
         self.search_edit = QtWidgets.QLineEdit()
         self.search_edit.setPlaceholderText("Plugin name")
+        self.search_timer = QtCore.QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.search_timer.timeout.connect(self.apply_search_filter)
 
         settings_widget.layout().addWidget(self.plugin_choice)
         settings_widget.layout().addStretch()
@@ -222,8 +565,11 @@ class PluginManager(QtCore.QObject):
         settings_widget.layout().addWidget(self.search_edit)
         settings_widget.layout().addStretch()
 
-        pymodaq_version = QtWidgets.QLabel(f'PyMoDAQ Version: {get_pymodaq_version()}')
-        settings_widget.layout().addWidget(pymodaq_version)
+        self.pymodaq_version_label = QtWidgets.QLabel('PyMoDAQ Version: ...')
+        settings_widget.layout().addWidget(self.pymodaq_version_label)
+        self.refresh_label = QtWidgets.QLabel()
+        self.set_refresh_time(refreshing=True)
+        settings_widget.layout().addWidget(self.refresh_label)
 
         settings_widget.layout().addStretch()
         self.action_button = QtWidgets.QPushButton('Install')
@@ -231,6 +577,16 @@ class PluginManager(QtCore.QObject):
         self.action_button.clicked.connect(self.do_action)
         settings_widget.layout().addWidget(self.action_button)
 
+        self.job_progress = QtWidgets.QProgressBar()
+        self.job_progress.setRange(0, 0)  # busy indicator
+        self.job_progress.setMaximumWidth(100)
+        self.job_progress.setVisible(False)
+        settings_widget.layout().addWidget(self.job_progress)
+        self.cancel_button = QtWidgets.QPushButton('Cancel')
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_subprocess)
+        settings_widget.layout().addWidget(self.cancel_button)
+
         self.parent.layout().addWidget(settings_widget)
 
         search_widget = QtWidgets.QWidget()
@@ -244,32 +600,47 @@ class PluginManager(QtCore.QObject):
 
         self.filter_name_cb = QtWidgets.QCheckBox('Name')
         self.filter_name_cb.setCheckState(Qt.CheckState.Checked)
+        self.filter_name_cb.stateChanged.connect(self.apply_search_filter)
         search_widget.layout().addWidget(self.filter_name_cb)
 
         self.filter_description_cb = QtWidgets.QCheckBox('Description')
         self.filter_description_cb.setCheckState(Qt.CheckState.Unchecked)
+        self.filter_description_cb.stateChanged.connect(self.apply_search_filter)
         search_widget.layout().addWidget(self.filter_description_cb)
 
         self.filter_instrument_cb = QtWidgets.QCheckBox('Instruments')
         self.filter_instrument_cb.setCheckState(Qt.CheckState.Unchecked)
+        self.filter_instrument_cb.stateChanged.connect(self.apply_search_filter)
         search_widget.layout().addWidget(self.filter_instrument_cb)
 
         self.parent.layout().addWidget(search_widget)
 
         splitter = QtWidgets.QSplitter(Qt.Vertical)
 
-        self.table_view = TableView()
-
-        styledItemDelegate = QtWidgets.QStyledItemDelegate()
-        styledItemDelegate.setItemEditorFactory(SpinBoxDelegate())
-        self.table_view.setItemDelegate(styledItemDelegate)
-        self.table_view.horizontalHeader().show()
-        self.table_view.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+        self.prerender_timer = QtCore.QTimer()
+        self.prerender_timer.setSingleShot(True)
+        self.prerender_timer.setInterval(PRERENDER_DELAY)
+        self.prerender_timer.timeout.connect(self.prerender_visible)
+
+        self.view_stack = QtWidgets.QStackedWidget()
+        for view in VIEWS:
+            table_view = TableView()
+            table_view.verticalScrollBar().valueChanged.connect(self.prerender_timer.start)
+            styledItemDelegate = QtWidgets.QStyledItemDelegate(table_view)
+            styledItemDelegate.setItemEditorFactory(SpinBoxDelegate())
+            table_view.setItemDelegate(styledItemDelegate)
+            table_view.horizontalHeader().show()
+            table_view.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeToContents)
+            table_view.clicked.connect(self.item_clicked)
+            self.table_views[view] = table_view
+            self.view_stack.addWidget(table_view)
+        self.table_view = self.table_views[self.plugin_choice.currentText()]
 
         self.info_widget = QtWidgets.QTextEdit()
         self.info_widget.setReadOnly(True)
+        self.log_sink = LogSink(self.info_widget, max_lines=LOG_MAX_LINES)
 
-        splitter.addWidget(self.table_view)
+        splitter.addWidget(self.view_stack)
         splitter.addWidget(self.info_widget)
 
         self.parent.layout().addWidget(splitter)
@@ -282,57 +653,59 @@ class PluginManager(QtCore.QObject):
         self.filter_description_cb.setVisible(status)
         self.filter_name_cb.setVisible(status)
 
-    def setup_models(self, plugins: tuple):
-        self.plugins_available, self.plugins_installed, self.plugins_update = plugins
-
-        self.model_available = TableModel([[plugin['display-name'],
-                                            plugin['version']] for plugin in self.plugins_available],
-                                          header=['Plugin', 'Version'],
-                                          editable=[False, False],
-                                          plugins=self.plugins_available)
-        self.model_update = TableModel([[plugin['display-name'],
-                                         plugin['version']] for plugin in self.plugins_update],
-                                       header=['Plugin', 'Version'],
-                                       editable=[False, False],
-                                       plugins=self.plugins_update)
-        self.model_installed = TableModel([[plugin['display-name'],
-                                            plugin['version']] for plugin in self.plugins_installed],
-                                          header=['Plugin', 'Version'],
-                                          editable=[False, False],
-                                          plugins=self.plugins_installed)
-
-        model_available_proxy = FilterProxy(self)
-        model_available_proxy.setSourceModel(self.model_available)
-        self.search_edit.textChanged.connect(model_available_proxy.setTextFilter)
-        self.filter_name_cb.stateChanged.connect(model_available_proxy.invalidateFilter)
-        self.filter_description_cb.stateChanged.connect(model_available_proxy.invalidateFilter)
-        self.filter_instrument_cb.stateChanged.connect(model_available_proxy.invalidateFilter)
-        self.table_view.setModel(model_available_proxy)
-        self.table_view.setSortingEnabled(True)
-        self.table_view.clicked.connect(self.item_clicked)
+    def setup_models(self, plugins: List[PluginRecord], installed: Dict[str, str]):
+        """Create the model holding all the plugins and, once for all, a filter proxy for each view
+
+        Parameters
+        ----------
+        plugins: list of PluginRecord
+            the plugins available on pypi
+        installed: dict
+            the installed plugin names and versions as returned by get_installed_plugins
+        """
+        self.model = TableModel(plugins, installed, stale=self.stale_plugins, parent=self)
+        for view, (action, statuses) in VIEWS.items():
+            proxy = FilterProxy(self, statuses=statuses)
+            proxy.setSourceModel(self.model)
+            self.proxies[view] = proxy
+            self.table_views[view].setModel(proxy)
+            self.table_views[view].setSortingEnabled(True)
         self.enable_ui(True)
 
+    def set_plugin(self, plugin: PluginRecord):
+        """Add or update the row of a newly fetched plugin"""
+        name = normalize_name(plugin['plugin-name'])
+        self.stale_plugins.discard(name)
+        self._refreshed.add(name)
+        self.model.set_plugin(plugin)
+
+    def fetch_finished(self):
+        """Remove the rows of the plugins that are not available anymore, the ones that couldn't be fetched staying
+        stale"""
+        fetcher = self.plugin_thread.plugin_fetcher
+        if fetcher.complete:
+            failed = set([normalize_name(name) for name in fetcher.failed])
+            self.model.remove_plugins([plugin['plugin-name'] for plugin in self.model.plugins
+                                       if normalize_name(plugin['plugin-name']) not in self._refreshed | failed])
+            self.stale_plugins.intersection_update(failed)
+            self.set_refresh_time(time.time())
+            self.print_info('All plugins have been fetched')
+        else:
+            self.refresh_label.setText(self.refresh_label.text().replace('(refreshing...)', '(refresh failed)'))
+        self._refreshed = set([])
+        self.prerender_visible()
+
+    def selected_rows(self) -> List[int]:
+        """Get the rows of the model checked in the current view, stale ones excepted"""
+        statuses = self.proxies[self.plugin_choice.currentText()].statuses
+        return [row for row, selected in enumerate(self.model.selected)
+                if selected and self.model.get_status(row) in statuses and not self.model.is_stale(row)]
+
     def do_action(self):
-        indexes_plugin = []
-        plugins = []
-        if self.plugin_choice.currentText() == 'Available':
-            action = 'install'
-            for ind, plug in enumerate(self.model_available.get_data_all()):
-                if self.model_available.selected[ind]:
-                    plugins.append(plug[0])
-                    indexes_plugin.append(ind)
-        elif self.plugin_choice.currentText() == 'Update':
-            action = 'update'
-            for ind, plug in enumerate(self.model_update.get_data_all()):
-                if self.model_update.selected[ind]:
-                    plugins.append(plug[0])
-                    indexes_plugin.append(ind)
-        elif self.plugin_choice.currentText() == 'Installed':
-            action = 'remove'
-            for ind, plug in enumerate(self.model_installed.get_data_all()):
-                if self.model_installed.selected[ind]:
-                    plugins.append(plug[0])
-                    indexes_plugin.append(ind)
+        action = VIEWS[self.plugin_choice.currentText()][0]
+        rows = self.selected_rows()
+        plugins_selected = [self.model.plugins[row] for row in rows]
+        plugins = [self.model.get_data(row, 0) for row in rows]
 
         msgBox = QtWidgets.QMessageBox()
         msgBox.setText(f"You will {action} this list of plugins: {plugins}")
@@ -342,27 +715,23 @@ class PluginManager(QtCore.QObject):
         msgBox.setDefaultButton(QtWidgets.QMessageBox.StandardButton.Ok)
 
         ret = msgBox.exec()
-        self.info_widget.clear()
-        if ret == QtWidgets.QMessageBox.StandardButton.Ok:
-            for index in indexes_plugin:
-                # plugin_dict = get_plugin(plug)
-                if self.plugin_choice.currentText() == 'Available' or self.plugin_choice.currentText() == 'Update':
-                    if self.plugin_choice.currentText() == 'Available':
-                        plugin_dict = self.plugins_available[index]
-                    else:
-                        plugin_dict = self.plugins_update[index]
-                    if plugin_dict is not None:
-                        command = [sys.executable, '-m', 'pip', 'install',
-                                   f'{plugin_dict["plugin-name"]}=={plugin_dict["version"]}']
-                        self.do_subprocess(command)
-                    else:
-                        self.info_widget.insertPlainText(f'Plugin {plugin_dict["plugin-name"]} not found!')
+        self.log_sink.clear()
+        if ret == QtWidgets.QMessageBox.StandardButton.Ok and len(plugins_selected) != 0:
+            # a single pip transaction: one dependency resolution and nothing changed if it fails
+            self.do_subprocess(self.get_pip_command(action, plugins_selected),
+                               lambda exit_code, cancelled: self.action_finished(action, plugins_selected,
+                                                                                 exit_code, cancelled))
+        else:
+            self.ask_restart()
 
-                elif self.plugin_choice.currentText() == 'Installed':
-                    plugin_dict = self.plugins_installed[index]
-                    command = [sys.executable, '-m', 'pip', 'uninstall', '--yes', plugin_dict['plugin-name']]
-                    self.do_subprocess(command)
+    def action_finished(self, action: str, plugins: List[PluginRecord], exit_code: int, cancelled: bool):
+        """Report the outcome of a pip transaction, proposing to restart only if it succeeded"""
+        self.report_action(action, plugins)
+        self.model.set_installed(get_installed_plugins())
+        if exit_code == 0 and not cancelled:
+            self.ask_restart()
 
+    def ask_restart(self):
         msgBox = QtWidgets.QMessageBox()
         msgBox.setText(f"All actions were performed!")
         msgBox.setInformativeText(f"Do you want to quit and restart the application to take into account the modifications?")
@@ -376,60 +745,111 @@ class PluginManager(QtCore.QObject):
         elif msgBox.clickedButton() is restart_button:
             self.restart()
 
-    def print_info(self, message: str):
-        self.info_widget.moveCursor(QTextCursor.End)
-        self.info_widget.insertPlainText(f'{message}\n')
-        self.info_widget.moveCursor(QTextCursor.End)
-        QtCore.QThread.msleep(100)
-        QtWidgets.QApplication.processEvents()
+    @staticmethod
+    def get_pip_command(action: str, plugins: List[PluginRecord]) -> List[str]:
+        """Get the pip command installing, updating or removing all the given plugins at once"""
+        if action == 'remove':
+            return [sys.executable, '-m', 'pip', 'uninstall', '--yes'] + [plugin['plugin-name'] for plugin in plugins]
+        return [sys.executable, '-m', 'pip', 'install'] + [f'{plugin["plugin-name"]}=={plugin["version"]}'
+                                                           for plugin in plugins]
+
+    def report_action(self, action: str, plugins: List[PluginRecord]):
+        """Print the outcome of the pip transaction for each plugin, checked from the installed distributions"""
+        invalidate_installed_index()
+        installed = get_installed_index()
+        for plugin in plugins:
+            version = installed.get_version(plugin['plugin-name'])
+            if action == 'remove':
+                success = version is None
+            else:
+                success = version is not None and version_mod.parse(version) == version_mod.parse(plugin['version'])
+            self.print_info(f'{action} {plugin["plugin-name"]}: {"done" if success else "failed"}'
+                            f' (installed version: {version})')
 
-    def do_subprocess(self, command):
-        try:
-            self.print_info(' '.join(command))
-
-            with subprocess.Popen(command, stdout=subprocess.PIPE, universal_newlines=True) as sp:
-                while True:
-                    self.print_info(sp.stdout.readline())
-                    return_code = sp.poll()
-                    if return_code is not None:
-                        self.info_widget.insertPlainText(str(return_code))
-                        for output in sp.stdout.readlines():
-                            print(output.strip())
-                        break
-        except Exception as e:
-            logger.info(str(e))
-            subprocess.Popen(command)
+    def print_info(self, message: str):
+        self.log_sink.write(message)
+
+    def do_subprocess(self, command: List[str], callback=None):
+        """Run a command in the background, its output being streamed in the info pane
+
+        Parameters
+        ----------
+        command: list of str
+        callback: Callable
+            called with the exit code and whether the command has been cancelled, once the command finished, failed
+            or has been cancelled
+        """
+        self.print_info(' '.join(command))
+        self.job = PipJob(command, self)
+        self.job.output_signal.connect(self.print_info)
+        self.job.finished_signal.connect(self.subprocess_finished)
+        if callback is not None:
+            self.job.finished_signal.connect(lambda exit_code, cancelled, duration: callback(exit_code, cancelled))
+        self.action_button.setEnabled(False)
+        self.plugin_choice.setEnabled(False)
+        self.cancel_button.setEnabled(True)
+        self.job_progress.setVisible(True)
+        self.job.start()
+
+    def cancel_subprocess(self):
+        if self.job is not None:
+            self.print_info('Cancelling...')
+            self.job.cancel()
+
+    def subprocess_finished(self, exit_code: int, cancelled: bool, duration: float):
+        if cancelled:
+            self.print_info(f'Cancelled after {duration:.1f} s')
+        elif exit_code == 0:
+            self.print_info(f'Done in {duration:.1f} s')
+        else:
+            self.print_info(f'Failed with exit code {exit_code} after {duration:.1f} s')
+        self.job.deleteLater()
+        self.job = None
+        self.cancel_button.setEnabled(False)
+        self.job_progress.setVisible(False)
+        self.plugin_choice.setEnabled(True)
+        self.action_button.setEnabled(len(self.selected_rows()) != 0)
 
     def update_model(self, plugin_choice):
-        self.search_edit.textChanged.disconnect()
-        self.model_proxy = FilterProxy(self)
-        if plugin_choice == 'Available':
-            self.model_proxy.setSourceModel(self.model_available)
-            self.action_button.setText('Install')
-        elif plugin_choice == 'Update':
-            self.model_proxy.setSourceModel(self.model_update)
-            self.action_button.setText('Update')
-        elif plugin_choice == 'Installed':
-            self.model_proxy.setSourceModel(self.model_installed)
-            self.action_button.setText('Remove')
-        self.search_edit.textChanged.connect(self.model_proxy.setTextFilter)
-        self.table_view.setModel(self.model_proxy)
-        self.item_clicked(self.model_proxy.index(0, 0))
+        """Display the view of the chosen plugins, its filter being updated only if the search changed since"""
+        proxy = self.proxies[plugin_choice]
+        if proxy.is_outdated(self.search_edit.text()):
+            proxy.setTextFilter(self.search_edit.text())
+        self.table_view = self.table_views[plugin_choice]
+        self.view_stack.setCurrentWidget(self.table_view)
+        self.action_button.setText(VIEWS[plugin_choice][0].capitalize())
+        self.action_button.setEnabled(len(self.selected_rows()) != 0)
+        index = self.table_view.currentIndex()
+        self.item_clicked(index if index.isValid() else proxy.index(0, 0))
+        self.prerender_visible()
+
+    def apply_search_filter(self):
+        """Filter the displayed plugins with the search text, called once the typing paused"""
+        self.proxies[self.plugin_choice.currentText()].setTextFilter(self.search_edit.text())
+
+    def prerender_visible(self):
+        """Render in the background the descriptions of the visible rows and of their neighbours"""
+        model = self.table_view.model()
+        if model is None or model.rowCount() == 0:
+            return
+        first = self.table_view.rowAt(0)
+        last = self.table_view.rowAt(self.table_view.viewport().height() - 1)
+        first = 0 if first < 0 else first
+        last = model.rowCount() - 1 if last < 0 else last
+        plugins = model.sourceModel().plugins
+        self.prerender_signal.emit([plugins[model.mapToSource(model.index(row, 0)).row()]
+                                    for row in range(max(0, first - PRERENDER_MARGIN),
+                                                     min(model.rowCount(), last + PRERENDER_MARGIN + 1))])
 
     def item_clicked(self, index):
         if index.isValid():
             self.display_info(index)
-            self.action_button.setEnabled(bool(np.any(index.model().sourceModel().selected)))
+            self.action_button.setEnabled(len(self.selected_rows()) != 0)
 
     def display_info(self, index):
-        self.info_widget.clear()
+        self.log_sink.clear()
         if index.isValid():
-            if self.plugin_choice.currentText() == 'Available':
-                plugin = self.plugins_available[index.model().mapToSource(index).row()]
-            elif self.plugin_choice.currentText() == 'Update':
-                plugin = self.plugins_update[index.model().mapToSource(index).row()]
-            elif self.plugin_choice.currentText() == 'Installed':
-                plugin = self.plugins_installed[index.model().mapToSource(index).row()]
+            plugin = self.model.plugins[index.model().mapToSource(index).row()]
             # doc, tag, text = Doc().tagtext()
             #
             # with tag('p'):
@@ -453,7 +873,7 @@ class PluginManager(QtCore.QObject):
             #                 with tag('li'):
             #                     text(instt)
             # self.info_widget.insertHtml(doc.getvalue())
-            self.info_widget.insertHtml(render(plugin['description']))
+            self.info_widget.insertHtml(self.render_cache.get(plugin))
 
 
 def main_without_qt():
@@ -466,7 +886,12 @@ def main_without_qt():
 
 
 def main():
-    app = QtWidgets.QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Manager and interface to list, install or remove PyMoDAQ's plugins")
+    add_profile_argument(parser)
+    args, qt_args = parser.parse_known_args()
+    profiler.enabled = args.profile is not None
+
+    app = QtWidgets.QApplication(sys.argv[:1] + qt_args)
     win = QtWidgets.QMainWindow()
     win.setWindowTitle('PyMoDAQ Plugin Manager')
     widget = QtWidgets.QWidget()
@@ -474,6 +899,9 @@ def main():
     win.show()
     prog = PluginManager(widget, standalone=True)
     app.exec()
+    prog.stop_threads()
+    if profiler.enabled:
+        profiler.dump(args.profile)
 
 
 if __name__ == '__main__':
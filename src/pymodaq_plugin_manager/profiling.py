@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight instrumentation of the catalog refresh
+
+When enabled (--profile option of the plugin_manager and write_plugins_doc entry points), the module profiler records
+the wall time of each phase of a refresh (index listing, package resolution, installed plugins scan...) and, for each
+package, the time spent, the number of requests, the bytes transferred and the cache hits. When disabled, hooks return
+immediately.
+"""
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Union
+
+INDEX = '<index>'  # pseudo package to which requests made outside of a package resolution are attributed
+
+
+class Profiler:
+    """Collect timings and request statistics, thread safe"""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._phases = dict([])
+            self._packages = dict([])
+            self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a phase of the refresh, phases with the same name are summed"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._lock:
+                phase = self._phases.setdefault(name, dict(time=0., count=0))
+                phase['time'] += duration
+                phase['count'] += 1
+
+    @contextmanager
+    def package(self, name: str):
+        """Time the resolution of a package, the requests issued meanwhile by this thread are attributed to it"""
+        if not self.enabled:
+            yield
+            return
+        self._local.package = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self._local.package = None
+            with self._lock:
+                self._get_package(name)['time'] += duration
+
+    def _get_package(self, name: str) -> dict:
+        return self._packages.setdefault(name, dict(time=0., requests=0, bytes=0, cache_hits=0, revalidated=0))
+
+    def record_request(self, nbytes: int):
+        """Record a request to the index and the size of its body"""
+        if not self.enabled:
+            return
+        with self._lock:
+            package = self._get_package(getattr(self._local, 'package', None) or INDEX)
+            package['requests'] += 1
+            package['bytes'] += nbytes
+
+    def record_cache(self, key: str):
+        """Record a cache event: 'cache_hits' or 'revalidated'"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._get_package(getattr(self._local, 'package', None) or INDEX)[key] += 1
+
+    def report(self) -> dict:
+        """Get the collected data as a json serializable dict"""
+        with self._lock:
+            packages = {name: dict(stats) for name, stats in self._packages.items()}
+            report = dict(total_time=time.perf_counter() - self._start,
+                          phases={name: dict(phase) for name, phase in self._phases.items()},
+                          packages=packages)
+        report['totals'] = {key: sum(stats[key] for stats in packages.values())
+                            for key in ('requests', 'bytes', 'cache_hits', 'revalidated')}
+        return report
+
+    def dump(self, path: Union[str, Path] = None):
+        """Write the report as json in a file or on the standard output if path is None or '-'"""
+        content = json.dumps(self.report(), indent=2)
+        if path is None or str(path) == '-':
+            sys.stdout.write(content + '\n')
+        else:
+            with open(path, 'w') as f:
+                f.write(content)
+
+
+profiler = Profiler()
+
+
+def add_profile_argument(parser):
+    """Add the --profile option to an argparse parser"""
+    parser.add_argument('--profile', nargs='?', const='-', default=None, metavar='FILE',
+                        help='record timings and request statistics of the catalog refresh and write them as json '
+                             'in FILE (standard output if not given)')
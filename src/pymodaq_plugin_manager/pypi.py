@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Access to the pypi json API through the on-disk metadata cache
+
+Mirrors the functions of pymodaq_utils.packages used by the plugin manager
+"""
+import logging
+from typing import Dict, List, Optional, Union
+
+from packaging.version import InvalidVersion, Version
+
+from pymodaq_plugin_manager.cache import MetadataCache, metadata_cache, IMMUTABLE_TTL
+from pymodaq_plugin_manager import session
+from pymodaq_plugin_manager.session import get_index_url
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.StreamHandler())
+
+SIMPLE_JSON = 'application/vnd.pypi.simple.v1+json'  # PEP 691
+
+
+def get_pypi_package_serials(match_name: Union[str, List[str]] = None,
+                             print_method=logger.info, deadline: float = None) -> Dict[str, Optional[int]]:
+    """Connect to the "simple" pypi url to get all packages matching all or part of the given name, together with
+    their last serial
+
+    The serial of a project changes each time something is published for it. The json form of the simple api (PEP 691)
+    is requested, if the index only serves html (some mirrors), the serials are None.
+
+    Parameters
+    ----------
+    match_name: str or list of str
+        The package name to be (partially) matched
+    print_method: Callable
+    deadline: float
+        absolute time (time.monotonic() based) after which the request is abandoned
+
+    Returns
+    -------
+    dict: package names as keys and last serials as values
+
+    Raises
+    ------
+    FetchError: if the index cannot give the list
+    """
+    if isinstance(match_name, str):
+        match_name = [match_name]
+    print_method('Connecting to the pypi repository, may take some time to retrieve the list')
+    simple_package = session.get(f'{get_index_url()}/simple/', headers={'Accept': f'{SIMPLE_JSON}, text/html;q=0.1'},
+                                 deadline=deadline)
+    if simple_package.status_code != 200:
+        print_method('The service from pypi is currently unavailable, please retry later or install your plugins'
+                     ' manually')
+        raise session.FetchError(f'Could not get the package list: status code {simple_package.status_code}')
+    if simple_package.headers.get('Content-Type', '').startswith(SIMPLE_JSON):
+        projects = [(project['name'], project.get('_last-serial')) for project in simple_package.json()['projects']]
+    else:
+        from lxml import html  # only needed for the mirrors serving html
+        projects = [(child.text, None) for child in html.fromstring(simple_package.text).body]
+
+    packages = dict([])
+    for name, serial in projects:
+        if match_name is None or all([match in name for match in match_name]):
+            packages[name] = serial
+            print_method(f'Got package {name}')
+    return packages
+
+
+def get_package_metadata(name: str, version: Union[str, Version] = None, cache: MetadataCache = None,
+                         ttl: float = None, deadline: float = None) -> dict:
+    """Retrieve the metadata of a given package on pypi matching or not a specific version
+
+    Parameters
+    ----------
+    name: str
+        package name
+    version: Union[str, Version]
+        package version specifier
+    cache: MetadataCache
+        the cache to use (default to the module one)
+    ttl: float
+        overrides the time to live of the cache (0 forces a revalidation)
+    deadline: float
+        absolute time (time.monotonic() based) after which the server is not contacted anymore
+
+    Returns
+    -------
+    dict of metadata
+    """
+    cache = metadata_cache if cache is None else cache
+    if version is None:
+        return cache.get(f'{get_index_url()}/pypi/{name}/json', ttl=ttl, deadline=deadline)
+    else:
+        return cache.get(f'{get_index_url()}/pypi/{name}/{str(version)}/json', ttl=IMMUTABLE_TTL,
+                         deadline=deadline)
+
+
+def get_pypi_pymodaq(package_name='pymodaq-plugins', pymodaq_version: Version = None,
+                     pymodaq_latest: Version = None, cache: MetadataCache = None, revalidate=False,
+                     deadline: float = None):
+    """ Get the latest plugin info compatible with a given version of pymodaq
+
+    Parameters
+    ----------
+    package_name: str
+    pymodaq_version: Version
+    pymodaq_latest: Version
+    cache: MetadataCache
+    revalidate: bool
+        if True, the list of releases is checked against the server even if the cache is fresh
+    deadline: float
+        absolute time (time.monotonic() based) after which the server is not contacted anymore
+
+    Returns
+    -------
+    dict containing metadata of the latest compatible plugin
+    """
+    from pymodaq_utils.packages import get_metadata_from_json, get_pymodaq_specifier
+
+    if package_name == 'pymodaq-plugins':  # has been renamed pymodaq-plugins-mock
+        return
+    if isinstance(pymodaq_version, str):
+        pymodaq_version = Version(pymodaq_version)
+    if pymodaq_latest is None:
+        pymodaq_latest = Version(list(get_package_metadata('pymodaq', cache=cache,
+                                                           deadline=deadline)['releases'].keys())[-1])
+    latest = get_package_metadata(package_name, cache=cache, ttl=0 if revalidate else None, deadline=deadline)
+    if latest is not None:
+        if pymodaq_version is not None:
+            versions = list(latest['releases'].keys())[::-1]
+            for _version in versions:
+                versioned = get_package_metadata(package_name, _version, cache=cache, deadline=deadline)
+                if versioned is not None:
+                    specifier = get_pymodaq_specifier(versioned['info']['requires_dist'])
+                    if str(specifier) == '>=2.0':  # very old stuff
+                        return
+                    if pymodaq_version.base_version in specifier:
+                        return get_metadata_from_json(versioned)
+                    elif pymodaq_latest == pymodaq_version:  # if not in specifier and requested pymodaq version is
+                        # latest, not need to loop into older package versions, they won't be compatible either
+                        return
+        else:
+            return get_metadata_from_json(latest)
+
+
+def get_series_key(version: Union[str, Version]) -> str:
+    """Get the minor series (major.minor) of a version, for instance 4.4 for 4.4.7"""
+    version = Version(str(version))
+    return f'{version.major}.{version.minor}'
+
+
+def _sorted_releases(releases) -> List[str]:
+    """Sort release versions as published, newest first, invalid ones being ignored"""
+    versions = []
+    for release in releases:
+        try:
+            versions.append((Version(release), release))
+        except InvalidVersion:
+            pass
+    return [release for _, release in sorted(versions, reverse=True)]
+
+
+def get_pymodaq_series(cache: MetadataCache = None, minimum: Union[str, Version] = '3.0') -> Dict[str, Version]:
+    """Get the minor series of the pymodaq final releases, together with the latest release of each series
+
+    Returns
+    -------
+    dict: series (major.minor) as keys, latest release of each series as values (newest series first)
+    """
+    pymodaq = get_package_metadata('pymodaq', cache=cache)
+    series = dict([])
+    if pymodaq is not None:
+        for release in map(Version, _sorted_releases(pymodaq['releases'])):
+            if not release.is_prerelease and release >= Version(str(minimum)):
+                series.setdefault(get_series_key(release), release)
+    return series
+
+
+def get_pypi_compatibility(package_name: str, series: Dict[str, Version], cache: MetadataCache = None,
+                           revalidate=False) -> Dict[str, str]:
+    """Get, in one pass over the releases of a package, its newest release compatible with each pymodaq series
+
+    Parameters
+    ----------
+    package_name: str
+    series: dict
+        pymodaq series as returned by get_pymodaq_series
+    cache: MetadataCache
+    revalidate: bool
+        if True, the list of releases is checked against the server even if the cache is fresh
+
+    Returns
+    -------
+    dict: series as keys, newest compatible release of the package as values (incompatible series are missing)
+    """
+    from pymodaq_utils.packages import get_pymodaq_specifier
+
+    compatibility = dict([])
+    latest = get_package_metadata(package_name, cache=cache, ttl=0 if revalidate else None)
+    if latest is None:
+        return compatibility
+    for release in _sorted_releases(latest['releases']):
+        if len(compatibility) == len(series):
+            break
+        versioned = get_package_metadata(package_name, release, cache=cache)
+        if versioned is not None:
+            specifier = get_pymodaq_specifier(versioned['info']['requires_dist'])
+            if str(specifier) == '>=2.0':  # very old stuff
+                break
+            for key, pymodaq_version in series.items():
+                if key not in compatibility and pymodaq_version.base_version in specifier:
+                    compatibility[key] = release
+    return compatibility
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Html rendering of the plugin descriptions displayed in the info pane of the plugin manager
+
+Renderings are kept in a LRU cache keyed by the hash of the description, so that clicking back and forth between rows
+doesn't render the same README again, and that records sharing a name and version (an installed record built from
+another release) but not their description don't share a rendering. The cache is thread safe so that rows can
+be rendered in advance by a background worker.
+"""
+import hashlib
+import html
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from qtpy import QtCore
+
+from pymodaq_plugin_manager.catalog import PluginLike
+
+RENDER_CACHE_SIZE = 256  # maximum number of rendered descriptions kept in memory
+
+
+def render_description(description: str) -> str:
+    """Render a reStructuredText description as html, as preformatted text if it is not valid rst"""
+    from readme_renderer.rst import render
+    rendered = render(description or '')
+    if rendered is None:
+        rendered = f'<pre>{html.escape(description or "")}</pre>'
+    return rendered
+
+
+class RenderCache:
+    """LRU cache of the html renderings of plugin descriptions, thread safe
+
+    Parameters
+    ----------
+    maxsize: int
+        the maximum number of renderings kept
+    """
+
+    def __init__(self, maxsize: int = RENDER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._renderings = OrderedDict([])
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(plugin: PluginLike) -> str:
+        return hashlib.sha1((plugin['description'] or '').encode('utf-8')).hexdigest()
+
+    def __contains__(self, plugin: PluginLike) -> bool:
+        with self._lock:
+            return self.key(plugin) in self._renderings
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._renderings)
+
+    def get(self, plugin: PluginLike) -> str:
+        """Get the html rendering of the description of a plugin, rendering it if not in the cache"""
+        key = self.key(plugin)
+        with self._lock:
+            if key in self._renderings:
+                self._renderings.move_to_end(key)
+                return self._renderings[key]
+        rendered = render_description(plugin['description'])  # outside of the lock, may be long
+        with self._lock:
+            self._renderings[key] = rendered
+            self._renderings.move_to_end(key)
+            while len(self._renderings) > self.maxsize:
+                self._renderings.popitem(last=False)
+        return rendered
+
+    def clear(self):
+        with self._lock:
+            self._renderings.clear()
+
+
+class DescriptionPrerenderer(QtCore.QObject):
+    """Worker rendering descriptions into a RenderCache in advance, to be moved to a QThread"""
+
+    def __init__(self, cache: RenderCache):
+        super().__init__()
+        self.cache = cache
+
+    def prerender(self, plugins: Iterable[PluginLike]):
+        for plugin in plugins:
+            if plugin not in self.cache:
+                self.cache.get(plugin)
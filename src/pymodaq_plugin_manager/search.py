@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""
+Search index of the plugins displayed in the plugin manager
+
+Searchable fields (names, description, instruments) are lowered once when a plugin is added and their words are
+indexed, so that a query only checks the rows having, for each of its words, a word containing it instead of lowering
+and scanning the full description of every row at each keystroke.
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+from pymodaq_plugin_manager.catalog import PluginLike
+from pymodaq_plugin_manager.instruments import get_plugin_instruments
+
+FIELDS = ('name', 'description', 'instruments')
+
+
+class SearchIndex:
+    """Inverted index of the searchable fields of a list of plugins, rows being their positions in the list
+
+    The index keeps a revision number, incremented by each change, and the revision at which each row was last
+    indexed, so that searches done at a given revision can tell which rows changed since
+
+    Parameters
+    ----------
+    plugins: iterable of PluginRecord or dict
+    """
+
+    def __init__(self, plugins: Iterable[PluginLike] = ()):
+        self._texts: Dict[str, List[str]] = {field: [] for field in FIELDS}
+        self._postings: Dict[str, Dict[str, List[int]]] = {field: dict([]) for field in FIELDS}
+        self._vocabularies: Dict[str, str] = dict([])  # all the words of a field, one per line, built on demand
+        self.revision = 0
+        self._revisions: List[int] = []  # revision at which each row was indexed
+        for plugin in plugins:
+            self.add(plugin)
+
+    def __len__(self) -> int:
+        return len(self._texts['name'])
+
+    def get_revision(self, row: int) -> int:
+        """Get the revision at which a row was last indexed"""
+        return self._revisions[row]
+
+    @staticmethod
+    def _get_texts(plugin: PluginLike) -> Dict[str, str]:
+        instruments = get_plugin_instruments(plugin)
+        return dict(name=f"{plugin['plugin-name']}\n{plugin['display-name']}".lower(),
+                    description=(plugin['description'] or '').lower(),
+                    instruments='\n'.join([instrument for instrument_type in instruments
+                                           for instrument in instruments[instrument_type]]).lower())
+
+    def add(self, plugin: PluginLike):
+        """Index a plugin as the next row"""
+        row = len(self)
+        for field, text in self._get_texts(plugin).items():
+            self._texts[field].append(text)
+            postings = self._postings[field]
+            for word in set(text.split()):
+                postings.setdefault(word, []).append(row)
+        self._vocabularies.clear()
+        self.revision += 1
+        self._revisions.append(self.revision)
+
+    def set(self, row: int, plugin: PluginLike):
+        """Index a plugin in place of the one of an existing row"""
+        for field, text in self._get_texts(plugin).items():
+            previous = self._texts[field][row]
+            if text == previous:
+                continue
+            postings = self._postings[field]
+            for word in set(previous.split()):
+                postings[word].remove(row)
+                if len(postings[word]) == 0:
+                    del postings[word]
+            for word in set(text.split()):
+                postings.setdefault(word, []).append(row)
+            self._texts[field][row] = text
+        self._vocabularies.clear()
+        self.revision += 1
+        self._revisions[row] = self.revision
+
+    def match(self, row: int, text: str, fields: Tuple[str, ...] = FIELDS) -> bool:
+        """Check if the lowered text is contained in one of the given fields of a row"""
+        return any(text in self._texts[field][row] for field in fields)
+
+    def _candidates(self, field: str, text: str) -> Set[int]:
+        """Rows having, for each word of the text, a word containing it: the only ones that may contain the text"""
+        postings = self._postings[field]
+        if field not in self._vocabularies:
+            self._vocabularies[field] = '\n' + '\n'.join(postings) + '\n'
+        vocabulary = self._vocabularies[field]
+        candidates = None
+        for token in set(text.split()):
+            rows = set()
+            position = vocabulary.find(token)
+            while position != -1:
+                start = vocabulary.rfind('\n', 0, position) + 1
+                end = vocabulary.find('\n', position)
+                rows.update(postings[vocabulary[start:end]])
+                position = vocabulary.find(token, end)
+            candidates = rows if candidates is None else candidates & rows
+            if len(candidates) == 0:
+                break
+        return set(range(len(self))) if candidates is None else candidates
+
+    def search(self, text: str, fields: Tuple[str, ...] = FIELDS) -> Set[int]:
+        """Get the rows whose given fields contain the text (case insensitive), all rows if the text is empty
+
+        Parameters
+        ----------
+        text: str
+        fields: tuple of str
+            names of the fields to look into, among FIELDS
+
+        Returns
+        -------
+        set of int: the matching rows
+        """
+        text = text.lower()
+        if text == '':
+            return set(range(len(self)))
+        rows = set()
+        for field in fields:
+            texts = self._texts[field]
+            rows.update([row for row in self._candidates(field, text) - rows if text in texts[row]])
+        return rows
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Shared HTTP session used for every request to the package index
+
+Connections are pooled and kept alive so that the TLS handshake is done once per connection instead of once per
+request. The index defaults to pypi but can be changed (environment variable PYMODAQ_PLUGIN_INDEX_URL or
+set_index_url) to point to a mirror (devpi, bandersnatch...) or to a local server. The index should serve the
+simple api under <index url>/simple/ and the json api under <index url>/pypi/<package>/json.
+
+Requests are bounded by a timeout, retried with a capped exponential backoff on connection errors, timeouts and
+429/502/503/504 responses (honoring their Retry-After header, the error being returned at once if it asks to wait more
+than BACKOFF_MAX) and can be given an absolute deadline (time.monotonic() based) that no retry or wait can exceed.
+"""
+import os
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Optional
+
+from pymodaq_plugin_manager.profiling import profiler
+
+DEFAULT_INDEX_URL = 'https://pypi.org'
+INDEX_URL_ENV = 'PYMODAQ_PLUGIN_INDEX_URL'
+POOL_SIZE = 16  # maximum number of kept alive connections per host
+TIMEOUT = (5., 30.)  # connect and read timeouts of a request in seconds
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5  # in seconds, doubled at each retry
+BACKOFF_MAX = 10.  # in seconds, also the longest Retry-After honored
+RETRY_STATUS = (429, 502, 503, 504)
+
+_index_url = os.environ.get(INDEX_URL_ENV, DEFAULT_INDEX_URL).rstrip('/')
+_session: 'requests.Session' = None  # requests is imported on first use, it is slow to import
+_lock = threading.Lock()
+
+
+def get_index_url() -> str:
+    return _index_url
+
+
+def set_index_url(url: str = None):
+    """Set the base url of the package index (default to pypi if None)"""
+    global _index_url
+    _index_url = (DEFAULT_INDEX_URL if url is None else url).rstrip('/')
+
+
+def get_session() -> 'requests.Session':
+    """Get the session shared by all the requests to the index"""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+        return _session
+
+
+def close_session():
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+class FetchError(Exception):
+    """Raised when the index couldn't give an answer, within the deadline if any"""
+    pass
+
+
+def get_retry_delay(response: Optional['requests.Response'], attempt: int) -> float:
+    """Get the time to wait before a new attempt, from the Retry-After header if any or from an exponential backoff"""
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after is not None:
+        try:
+            return max(0., float(retry_after))
+        except ValueError:
+            try:
+                return max(0., (parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+
+
+def get(url: str, headers: dict = None, deadline: float = None, retries: int = MAX_RETRIES) -> 'requests.Response':
+    """GET an url with the shared session, with timeout, retries and backoff
+
+    Parameters
+    ----------
+    url: str
+    headers: dict
+    deadline: float
+        absolute time (as given by time.monotonic()) after which no request is issued anymore
+    retries: int
+        the maximum number of new attempts after a failure
+
+    Returns
+    -------
+    requests.Response: the last response obtained (may be a 429 or 503 if the retries are exhausted)
+
+    Raises
+    ------
+    FetchError: if no response could be obtained
+    """
+    import requests
+
+    attempt = 0
+    while True:
+        timeout = TIMEOUT
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FetchError(f'Deadline exceeded before getting {url}')
+            timeout = tuple(min(t, remaining) for t in TIMEOUT)
+        response = None
+        try:
+            response = get_session().get(url, headers=headers, timeout=timeout)
+            profiler.record_request(len(response.content))
+            if response.status_code not in RETRY_STATUS:
+                return response
+            error = f'status code {response.status_code}'
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = str(e)
+        if attempt >= retries:
+            if response is not None:
+                return response
+            raise FetchError(f'Could not get {url}: {error}')
+        delay = get_retry_delay(response, attempt)
+        if delay > BACKOFF_MAX:  # only from a Retry-After header: give up rather than stall the caller
+            return response
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            if response is not None:
+                return response
+            raise FetchError(f'Could not get {url} within the deadline: {error}')
+        time.sleep(delay)
+        attempt += 1
@@ -5,13 +5,14 @@ Created the 25/04/2023
 @author: Sebastien Weber
 """
 import copy
+from collections import deque
 from pathlib import Path
 import re
+import sys
 from packaging.version import Version, InvalidVersion
-import numpy as np
 
 
-from qtpy import QtCore, QtWidgets
+from qtpy import QtCore, QtGui, QtWidgets
 from qtpy.QtCore import QLocale, Qt, QModelIndex
 from qtpy import API_NAME
 
@@ -61,6 +62,31 @@ def decode_data(encoded_data):
     return data
 
 
+def is_ndarray(data) -> bool:
+    """Check if data is a numpy array without importing numpy (it can't be one if numpy isn't imported)"""
+    return 'numpy' in sys.modules and isinstance(data, sys.modules['numpy'].ndarray)
+
+
+def get_ranges(rows):
+    """Group row numbers into contiguous ranges
+
+    Parameters
+    ----------
+    rows: iterable of int
+
+    Returns
+    -------
+    list of tuple: (first row, number of rows) of each range, sorted by first row
+    """
+    ranges = []
+    for row in sorted(set(rows)):
+        if len(ranges) != 0 and ranges[-1][0] + ranges[-1][1] == row:
+            ranges[-1][1] += 1
+        else:
+            ranges.append([row, 1])
+    return [tuple(rng) for rng in ranges]
+
+
 class MyStyle(QtWidgets.QProxyStyle):
 
     def drawPrimitive(self, element, option, painter, widget=None):
@@ -119,12 +145,67 @@ class TableView(QtWidgets.QTableView):
         self.setDragDropOverwriteMode(False)
 
 
+class LogSink(QtCore.QObject):
+    """Buffered writer of log messages into a QTextEdit
+
+    Messages are queued and flushed together at most once per frame, so that a burst of messages costs a single
+    insertion and layout. The pane keeps only the last max_lines lines, and so does the queue if messages come faster
+    than the flushes.
+
+    Parameters
+    ----------
+    text_edit: QTextEdit or QPlainTextEdit
+    max_lines: int
+        the maximum number of lines kept in the pane
+    interval: int
+        the minimum time (in ms) between two flushes
+    """
+
+    def __init__(self, text_edit, max_lines=5000, interval=16):
+        super().__init__(text_edit)
+        self.text_edit = text_edit
+        self.max_lines = max_lines
+        self._pending = deque(maxlen=max_lines)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.flush)
+
+    def write(self, message: str):
+        self._pending.extend(str(message).rstrip('\n').split('\n'))
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        """Append the queued messages to the pane and drop its oldest lines above max_lines"""
+        if len(self._pending) == 0:
+            return
+        text = '\n'.join(self._pending) + '\n'
+        self._pending.clear()
+        cursor = QtGui.QTextCursor(self.text_edit.document())
+        cursor.movePosition(QtGui.QTextCursor.End)
+        cursor.insertText(text)
+        document = self.text_edit.document()
+        excess = document.blockCount() - 1 - self.max_lines  # the last block is the empty one after the last line
+        if excess > 0:
+            cursor.movePosition(QtGui.QTextCursor.Start)
+            cursor.setPosition(document.findBlockByNumber(excess).position(), QtGui.QTextCursor.KeepAnchor)
+            cursor.removeSelectedText()
+        self.text_edit.moveCursor(QtGui.QTextCursor.End)
+        self.text_edit.ensureCursorVisible()
+
+    def clear(self):
+        self._pending.clear()
+        self._timer.stop()
+        self.text_edit.clear()
+
+
 class TableModel(QtCore.QAbstractTableModel):
 
     def __init__(self, data, header, editable=True, parent=None, show_checkbox=False):
         QLocale.setDefault(QLocale(QLocale.English, QLocale.UnitedStates))
         super().__init__(parent)
-        if isinstance(data, np.ndarray):
+        if is_ndarray(data):
             data_tot = []
             for dat in data:
                 data_tot.append([float(d) for d in dat])
@@ -162,13 +243,60 @@ class TableModel(QtCore.QAbstractTableModel):
         return self._data
 
     def clear(self):
-        while self.rowCount(self.index(-1, -1)) > 0:
-            self.remove_row(0)
+        if self.rowCount(self.index(-1, -1)) > 0:
+            self.reset_data([])
 
     def set_data_all(self, data):
-        self.clear()
-        for row in data:
-            self.insert_data(self.rowCount(self.index(-1, -1)), [float(d) for d in row])
+        self.reset_data([[float(d) for d in row] for row in data])
+
+    def reset_data(self, data):
+        """Replace all the rows at once, attached views being reset a single time
+
+        Parameters
+        ----------
+        data: list of list
+            the new rows
+        """
+        self.beginResetModel()
+        self._remove_rows_data(0, self.rowCount(self.index(-1, -1)))
+        self._insert_rows_data(0, data)
+        self.endResetModel()
+
+    def insert_rows_data(self, row, data):
+        """Insert several rows at a given position with a single pair of insert signals
+
+        Parameters
+        ----------
+        row: int
+            position of the first inserted row
+        data: list of list
+            the inserted rows
+        """
+        if len(data) == 0:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(data) - 1)
+        self._insert_rows_data(row, data)
+        self.endInsertRows()
+
+    def remove_rows(self, rows):
+        """Remove several rows, with a single pair of remove signals for each contiguous range of rows
+
+        Parameters
+        ----------
+        rows: iterable of int
+        """
+        for start, count in reversed(get_ranges(rows)):
+            self.removeRows(start, count, self.index(-1, -1))
+
+    def _insert_rows_data(self, row, data):
+        """Store (a copy of) rows at a given position, to be subclassed to keep other per row info in sync"""
+        self._data[row:row] = [list(dat) for dat in data]
+        self._checked[row:row] = [False for _ in data]
+
+    def _remove_rows_data(self, row, count):
+        """Drop the stored rows of a range, to be subclassed to keep other per row info in sync"""
+        del self._data[row:row + count]
+        del self._checked[row:row + count]
 
     def data(self, index, role):
         if index.isValid():
@@ -261,9 +389,7 @@ class TableModel(QtCore.QAbstractTableModel):
 
     def insertRows(self, row, count, parent):
         self.beginInsertRows(QtCore.QModelIndex(), row, row + count - 1)
-        for ind in range(count):
-            self._data.insert(row + ind, self.data_tmp)
-            self._checked.insert(row + ind, False)
+        self._insert_rows_data(row, [self.data_tmp for ind in range(count)])
         self.endInsertRows()
         return True
 
@@ -272,13 +398,116 @@ class TableModel(QtCore.QAbstractTableModel):
 
     def removeRows(self, row, count, parent):
         self.beginRemoveRows(QModelIndex(), row, row + count - 1)
-        for ind in range(count):
-            self._data.pop(row + ind)
-            self._checked.pop(row + ind)
+        self._remove_rows_data(row, count)
         self.endRemoveRows()
         return True
 
 
+class ArrayTableModel(TableModel):
+    """Table model storing its rows in a numpy array, for large numeric tables
+
+    Columns sharing a single type are stored as a 2D array, columns of mixed types as a structured array (one field
+    per column). data() reads the array directly, raw_data and get_data_all give a read-only view of it (no copy),
+    whose rows can be given back to set_data_all, and whole tables are converted at once. Use TableModel for tables
+    mixing numbers with other types such as strings.
+
+    Parameters
+    ----------
+    data: ndarray or list of list
+        the rows of the table
+    header: list of str
+    dtypes: numpy dtype or list of numpy dtype
+        the type of each column, or of all of them (float by default)
+    editable: bool or list of bool
+    parent: QObject
+    show_checkbox: bool
+    """
+
+    def __init__(self, data, header, dtypes=float, editable=True, parent=None, show_checkbox=False):
+        import numpy as np
+        super().__init__([], header, editable=editable, parent=parent, show_checkbox=show_checkbox)
+        if not isinstance(dtypes, (list, tuple)):
+            dtypes = [dtypes for _ in header]
+        self.dtypes = [np.dtype(dtype) for dtype in dtypes]
+        if len(set(self.dtypes)) > 1:
+            self._array = np.empty((0,), dtype=[(f'f{ind}', dtype) for ind, dtype in enumerate(self.dtypes)])
+        else:
+            self._array = np.empty((0, len(self.dtypes)), dtype=self.dtypes[0] if len(self.dtypes) != 0 else float)
+        self._insert_rows_data(0, data)
+
+    @property
+    def raw_data(self):
+        """ndarray: read-only view of the rows, valid until the rows are changed"""
+        view = self._array.view()
+        view.flags.writeable = False
+        return view
+
+    def rowCount(self, parent):
+        return len(self._array)
+
+    def columnCount(self, parent):
+        return len(self.dtypes)
+
+    def _get_column(self, col: int):
+        """Writable view of a column of the stored rows"""
+        if self._array.dtype.names is not None:
+            return self._array[self._array.dtype.names[col]]
+        return self._array[:, col]
+
+    def get_data(self, row, col):
+        return self._get_column(col)[row].item()
+
+    def get_data_all(self):
+        return self.raw_data
+
+    def set_data_all(self, data):
+        self.reset_data(data)
+
+    def data(self, index, role):
+        if index.isValid() and (role == Qt.DisplayRole or role == Qt.EditRole):
+            return self.get_data(index.row(), index.column())
+        return super().data(index, role)
+
+    def setData(self, index, value, role):
+        if index.isValid() and role == Qt.EditRole:
+            if not self.validate_data(index.row(), index.column(), value):
+                return False
+            try:
+                value = self.dtypes[index.column()].type(value)
+            except (ValueError, TypeError, OverflowError):
+                return False
+            self._get_column(index.column())[index.row()] = value
+            self.dataChanged.emit(index, index, [role])
+            return True
+        return super().setData(index, value, role)
+
+    def _get_rows(self, data):
+        """Convert rows (a 2D or structured ndarray, or a list of list) into an array of the stored type"""
+        import numpy as np
+        dtype = self._array.dtype
+        if dtype.names is None:
+            if not is_ndarray(data) or data.dtype.names is not None:
+                data = list(data.tolist() if is_ndarray(data) else data)
+            return np.asarray(data, dtype=dtype).reshape((-1, len(self.dtypes)))
+        if not is_ndarray(data):
+            return np.array([tuple(row) for row in data], dtype=dtype)
+        rows = np.empty((len(data),), dtype=dtype)
+        for ind, name in enumerate(dtype.names):
+            rows[name] = data[data.dtype.names[ind]] if data.dtype.names is not None else data[:, ind]
+        return rows
+
+    def _insert_rows_data(self, row, data):
+        import numpy as np
+        rows = self._get_rows(data)
+        self._array = np.concatenate((self._array[:row], rows, self._array[row:]))
+        self._checked[row:row] = [False for _ in range(len(rows))]
+
+    def _remove_rows_data(self, row, count):
+        import numpy as np
+        self._array = np.delete(self._array, slice(row, row + count), axis=0)
+        del self._checked[row:row + count]
+
+
 def get_pymodaq_version():
     """Obtain pymodaq version from the VERSION file
 
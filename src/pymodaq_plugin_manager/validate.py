@@ -1,19 +1,26 @@
+import argparse
+import json
 import logging
-from typing import List, Union
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import Dict, Iterator, List, Tuple, Union
 import platform
 from hashlib import sha256
-from packaging import version
 from packaging.version import Version, parse
 
-from distlib.index import PackageIndex
 from pathlib import Path
 #using pip directly https://pip.pypa.io/en/latest/reference/pip_install/#git
-from pytablewriter import MarkdownTableWriter
-from yawrap import Doc
-from copy import deepcopy
 
-from pymodaq_utils.packages import get_pypi_package_list, get_pypi_pymodaq, get_entrypoints, \
-    extract_authors_from_description
+from pymodaq_plugin_manager.artifact import load_catalog, write_catalog, CATALOG_PATH
+from pymodaq_plugin_manager.cache import MetadataCache, CatalogSnapshot, metadata_cache, write_json_atomic
+from pymodaq_plugin_manager.catalog import PluginCatalog, PluginRecord
+from pymodaq_plugin_manager.session import FetchError
+from pymodaq_plugin_manager.profiling import profiler, add_profile_argument
+from pymodaq_plugin_manager.installed import get_installed_index
+from pymodaq_plugin_manager.instruments import get_instruments, get_plugin_instruments
+from pymodaq_plugin_manager.pypi import (get_pypi_pymodaq, get_pypi_package_serials, get_pymodaq_series,
+                                         get_pypi_compatibility)
 
 if parse(platform.python_version()) >= parse('3.8'):  # from version 3.8 this feature is included in the
     # standard lib
@@ -25,7 +32,15 @@ logger = logging.getLogger(__name__)
 logger.addHandler(logging.StreamHandler())
 logger.setLevel('INFO')
 
-pypi_index = PackageIndex()
+
+def __getattr__(name):
+    if name == 'pypi_index':  # distlib is slow to import and not used by the plugin manager itself
+        from distlib.index import PackageIndex
+        globals()['pypi_index'] = PackageIndex()
+        return globals()['pypi_index']
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+MAX_WORKERS = 8  # default number of concurrent requests to the pypi server
 
 
 def find_dict_in_list_from_key_val(dicts, key, value):
@@ -49,8 +64,118 @@ def find_dict_in_list_from_key_val(dicts, key, value):
     return None
 
 
+class FetchResult(list):
+    """List of plugins with, in the failed attribute, the packages that couldn't be resolved and why"""
+
+    def __init__(self, plugins=(), failed: Dict[str, str] = None):
+        super().__init__(plugins)
+        self.failed: Dict[str, str] = dict([]) if failed is None else failed
+
+
+def _iter_pypi_plugins(pymodaq_version: Union[Version, str] = None, print_method=logger.info,
+                       max_workers: int = MAX_WORKERS, cache: MetadataCache = None, timeout: float = None,
+                       failed: Dict[str, str] = None) -> Iterator[Tuple[int, PluginRecord]]:
+    """Yield (index in the pypi package list, plugin info) as soon as each plugin is resolved"""
+    exclude_plugins = ['pymodaq_plugins',
+                       'pymodaq_plugins_orsay',
+                       'pymodaq_plugins_template',
+                       'pymodaq_plugins_KDC101', #should not exists on its own but should be incorporated into thorlabs
+                       'pymodaq_plugins_AvaSpec',
+                       'pymodaq_plugins_MozzaSpectro',
+                       'pymodaq_plugins_template',
+                       ]
+    failed = dict([]) if failed is None else failed
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    cache = metadata_cache if cache is None else cache
+    with profiler.phase('index_list'):
+        serials = get_pypi_package_serials(['pymodaq', 'plugins'], print_method=print_method, deadline=deadline)
+    serials = {package.replace('-', '_'): serial for package, serial in serials.items()}
+    packages = [package for package in serials if package not in exclude_plugins]
+    with profiler.phase('pymodaq_latest'):
+        pymodaq_latest = Version(get_pypi_pymodaq('pymodaq', cache=cache, deadline=deadline)['version'])
+
+    # packages whose serial didn't move since the last refresh are not resolved again
+    with profiler.phase('snapshot_load'):
+        snapshot = CatalogSnapshot(cache.snapshot_path)
+    resolved = dict([])
+
+    def fetch_plugin(package: str):
+        print_method(f'Fetching metadata for package {package}')
+        with profiler.phase('package_resolution'), profiler.package(package):
+            metadata = get_pypi_pymodaq(package, pymodaq_version, pymodaq_latest, cache=cache,
+                                        revalidate=serials[package] is not None, deadline=deadline)
+        if metadata is not None:
+            #title = metadata['description'].split('\n')[0]
+            display_name = ' '.join(package.split('_')[2:]).capitalize()
+            return PluginRecord(plugin_name=package, display_name=display_name,
+                                version=metadata['version'], description=metadata['description'],
+                                instruments=get_instruments(metadata['description']),
+                                authors=[metadata['author']], homepage=metadata['project_url'])
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = dict([])
+    interrupted = True  # until the iteration ends, the consumer may stop early or an exception may be raised
+    try:
+        for index, package in enumerate(packages):
+            found, plugin = snapshot.lookup(pymodaq_version, pymodaq_latest, package, serials[package])
+            if found:
+                plugin = PluginRecord.from_dict(plugin) if plugin is not None else None
+                resolved[package] = plugin
+                if plugin is not None:
+                    yield index, plugin
+            else:
+                futures[executor.submit(fetch_plugin, package)] = index
+        remaining = max(0., deadline - time.monotonic()) if deadline is not None else None
+        try:
+            for future in as_completed(futures, timeout=remaining):
+                index = futures[future]
+                try:
+                    plugin = future.result()
+                except (FetchError, ValueError, KeyError, TypeError) as e:
+                    failed[packages[index]] = str(e)
+                    continue
+                resolved[packages[index]] = plugin
+                if plugin is not None:
+                    yield index, plugin
+        except FuturesTimeoutError:
+            pass
+        interrupted = False
+
+        for future, index in futures.items():
+            if packages[index] not in resolved and packages[index] not in failed:
+                failed[packages[index]] = 'Deadline exceeded'
+        if len(failed) != 0:
+            print_method(f'Could not fetch the metadata of the packages: {", ".join(failed)}')
+    finally:
+        # a consumer stopping early waits for the running resolutions (each bounded by the request timeouts) so that
+        # no worker outlives it, writing into the cache, while the deadline ones are already bounded by the deadline
+        executor.shutdown(wait=interrupted, cancel_futures=True)
+        # what has been resolved is saved even if interrupted, the other packages being resolved at the next refresh
+        with profiler.phase('snapshot_save'):
+            snapshot.update(pymodaq_version, pymodaq_latest,
+                            {package: (serials[package], plugin) for package, plugin in resolved.items()},
+                            partial=interrupted)
+            snapshot.save()
+
+
+def iter_pypi_plugins(browse_pypi=True, pymodaq_version: Union[Version, str] = None,
+                      print_method=logger.info, max_workers: int = MAX_WORKERS,
+                      cache: MetadataCache = None, timeout: float = None,
+                      failed: Dict[str, str] = None) -> Iterator[PluginRecord]:
+    """Yield the plugins (for a given version) of pymodaq as soon as they are resolved
+
+    Plugins whose resolution is known from the last refresh come first, then the others in their order of completion.
+    Parameters are the same as for `get_pypi_plugins`, failed being an optional dict filled with the packages that
+    couldn't be resolved.
+    """
+    for _, plugin in _iter_pypi_plugins(pymodaq_version=pymodaq_version, print_method=print_method,
+                                        max_workers=max_workers, cache=cache, timeout=timeout, failed=failed):
+        yield plugin
+
+
 def get_pypi_plugins(browse_pypi=True, pymodaq_version: Union[Version, str] = None,
-                     print_method=logger.info) -> List[dict]:
+                     print_method=logger.info, max_workers: int = MAX_WORKERS,
+                     cache: MetadataCache = None, timeout: float = None) -> FetchResult:
     """Fetch the list of plugins (for a given version) of pymodaq
 
     Parameters
@@ -61,37 +186,59 @@ def get_pypi_plugins(browse_pypi=True, pymodaq_version: Union[Version, str] = No
         a given pymodaq version (or the latest if None)
     print_method: Callable
         a callable accepting str argument
+    max_workers: int
+        the maximum number of packages whose metadata are fetched concurrently
+    cache: MetadataCache
+        the on-disk cache of the pypi metadata (default to the module one)
+    timeout: float
+        global deadline (in seconds) of the fetch, the plugins resolved in time are returned
 
     Returns
     -------
-    list of dictionaries giving info on plugins
+    FetchResult: list of PluginRecord (read as dict) giving info on plugins, in the order of the pypi package list,
+        with the packages that couldn't be resolved (error or deadline) in its failed attribute
+
+    See Also
+    --------
+    iter_pypi_plugins
     """
-    plugins = []
-    exclude_plugins = ['pymodaq_plugins',
-                       'pymodaq_plugins_orsay',
-                       'pymodaq_plugins_template',
-                       'pymodaq_plugins_KDC101', #should not exists on its own but should be incorporated into thorlabs
-                       'pymodaq_plugins_AvaSpec',
-                       'pymodaq_plugins_MozzaSpectro',
-                       'pymodaq_plugins_template',
-                       ]
-    packages = get_pypi_package_list(['pymodaq', 'plugins'], print_method=print_method)
-    pymodaq_latest = Version(get_pypi_pymodaq('pymodaq')['version'])
-    for package in packages:
-        package = package.replace('-', '_')
-        if package not in exclude_plugins:
-            print_method(f'Fetching metadata for package {package}')
-            metadata = get_pypi_pymodaq(package, pymodaq_version, pymodaq_latest)
-            if metadata is not None:
-                #title = metadata['description'].split('\n')[0]
-                display_name = ' '.join(package.split('_')[2:]).capitalize()
-                plugin = {'plugin-name': package, 'display-name': display_name,
-                          'version': metadata['version'],
-                          'id': '', 'repository': '', 'description': metadata['description'],
-                          'instruments': '', 'authors': [metadata['author']], 'contributors': [],
-                          'homepage': metadata['project_url']}
-                plugins.append(plugin)
-    return plugins
+    failed = dict([])
+    indexed_plugins = sorted(_iter_pypi_plugins(pymodaq_version=pymodaq_version, print_method=print_method,
+                                                max_workers=max_workers, cache=cache, timeout=timeout,
+                                                failed=failed),
+                             key=lambda indexed_plugin: indexed_plugin[0])
+    return FetchResult([plugin for _, plugin in indexed_plugins], failed)
+
+
+def get_compatibility_matrix(plugins: List[PluginRecord], print_method=logger.info,
+                             max_workers: int = MAX_WORKERS, cache: MetadataCache = None) -> dict:
+    """Get for each plugin its newest release compatible with each minor series of pymodaq
+
+    Parameters
+    ----------
+    plugins: list of PluginRecord
+        as returned by get_pypi_plugins
+    print_method: Callable
+    max_workers: int
+        the maximum number of packages whose releases are inspected concurrently
+    cache: MetadataCache
+
+    Returns
+    -------
+    dict with keys:
+        series: the latest pymodaq release of each minor series (major.minor)
+        plugins: for each plugin name, the newest compatible release for each series
+    """
+    series = get_pymodaq_series(cache=cache)
+
+    def fetch_compatibility(plugin: PluginRecord):
+        print_method(f'Checking compatibility of package {plugin.plugin_name}')
+        return get_pypi_compatibility(plugin.plugin_name, series, cache=cache)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        compatibility = dict(zip([plugin.plugin_name for plugin in plugins],
+                                 executor.map(fetch_compatibility, plugins)))
+    return {'series': {key: str(version) for key, version in series.items()}, 'plugins': compatibility}
 
 
 def get_plugin_sourcefile_id(filename):
@@ -105,13 +252,17 @@ def get_plugin_sourcefile_id(filename):
     return h.hexdigest()
 
 
-def get_plugins(from_json=False, browse_pypi=True, pymodaq_version: Version = None, print_method=logger.info):
+def get_plugins(from_json=False, browse_pypi=True, pymodaq_version: Version = None, print_method=logger.info,
+                max_workers: int = MAX_WORKERS, cache: MetadataCache = None, timeout: float = None):
     """get PyMoDAQ plugins
 
     Parameters
     ----------
     from_json: bool
-        if True get the plugins list and source files from the json data file (deprecated) else from the pypi server
+        if True get the plugins from the compressed catalog generated weekly and shipped with the package (no network
+        access, the compatible versions being looked up in its compatibility matrix, see artifact.load_catalog),
+        falling back to the pypi server if it is missing, invalid or doesn't know the pymodaq version. Otherwise
+        from the pypi server
     browse_pypi: bool
         if from_json is False:
             if True get the list of plugins name from the https://pypi.org/simple/ website, then get the sources from
@@ -121,35 +272,65 @@ def get_plugins(from_json=False, browse_pypi=True, pymodaq_version: Version = No
         the current version of PyMoDAQ
     print_method: Callable
         a callable accepting string
+    max_workers: int
+        the maximum number of concurrent requests to the pypi server
+    cache: MetadataCache
+        the on-disk cache of the pypi metadata (default to the module one)
+    timeout: float
+        global deadline (in seconds) of the fetch from the pypi server, only the plugins resolved in time are returned
     Returns
     -------
     plugins_available: list of available plugins for installation
     plugins_installed: list of already installed plugins
     plugins_update: list of plugins with existing update
     """
-    print_method('Fetching plugin list')
-    plugins_available = get_pypi_plugins(browse_pypi=browse_pypi, pymodaq_version=pymodaq_version,
-                                         print_method=print_method)
-
-    plugins = deepcopy(plugins_available)
-    discovered_plugins = get_entrypoints('pymodaq.plugins')
-    plugins_installed_init = [{'plugin-name': entry.value,
-                          'version': metadata.version(entry.value)} for entry in discovered_plugins]
-    plugins_installed = []
-    for plug in plugins_installed_init:
-        d = find_dict_in_list_from_key_val(plugins_available, 'plugin-name', plug['plugin-name'])
-        if d is not None:
-            d.update(plug)
-            plugins_installed.append(d)
-            plugins_available.pop(plugins_available.index(d))
-
-    plugins_update = []
-    for plug in plugins_installed:
-        d = find_dict_in_list_from_key_val(plugins, 'plugin-name', plug['plugin-name'])
-        if version.parse(d['version']) > version.parse(plug['version']):
-            plugins_update.append(d)
-
-    return plugins_available, plugins_installed, plugins_update
+    plugins_available = None
+    if from_json:
+        print_method('Loading plugin catalog')
+        plugins_available = load_catalog(pymodaq_version=pymodaq_version)
+        if plugins_available is None:
+            print_method('The plugin catalog could not be loaded, falling back to the pypi server')
+    if plugins_available is None:
+        print_method('Fetching plugin list')
+        plugins_available = get_pypi_plugins(browse_pypi=browse_pypi, pymodaq_version=pymodaq_version,
+                                             print_method=print_method, max_workers=max_workers,
+                                             cache=cache, timeout=timeout)
+
+    return split_plugins(plugins_available, get_installed_plugins())
+
+
+def get_installed_plugins() -> Dict[str, str]:
+    """Get the name and version of the installed plugins declaring a pymodaq.plugins entrypoint
+
+    The installed distributions are scanned once and cached until the environment changes, see get_installed_index
+    """
+    with profiler.phase('installed_scan'):
+        entry_points = get_installed_index().entry_points.get('pymodaq.plugins', [])
+    return {entry.value: version for entry, version in entry_points}
+
+
+def split_plugins(plugins_available: List[PluginRecord], installed: Dict[str, str]):
+    """Sort plugins into the available, installed and updatable ones
+
+    Parameters
+    ----------
+    plugins_available: list of PluginRecord
+        info on plugins as returned by get_pypi_plugins
+    installed: dict
+        the installed versions as returned by get_installed_plugins
+
+    Returns
+    -------
+    plugins_available: list of available plugins for installation
+    plugins_installed: list of already installed plugins
+    plugins_update: list of plugins with existing update
+
+    See Also
+    --------
+    PluginCatalog.partition
+    """
+    with profiler.phase('partition'):
+        return PluginCatalog(plugins_available).partition(installed)
 
 
 def capitalize(string, Nfirst=1):
@@ -165,96 +346,157 @@ def capitalize(string, Nfirst=1):
     """
     return string[:Nfirst].upper() + string[Nfirst:]
 
-def write_plugin_doc():
-    """Update the README from info of all available plugins"""
+DOC_FORMAT = 2  # to be incremented each time the rendering of the rows changes, invalidating the cached rows
+
+
+def render_plugin_row(plug: PluginRecord, header_keys=('display-name', 'version', 'description')) -> List[str]:
+    """Render the cells of the row of a plugin in the plugin table of the README"""
+    from yawrap import Doc
+    tmp = []
+    for k in header_keys:
+        if k == 'display-name':
+            tmp.append(f'<a href="{plug["homepage"].rstrip()}"'
+                       f' target="_top">'
+                       f'{capitalize(plug["plugin-name"].rstrip()[16:])}'
+                       f'</a> ')
+        elif k == 'authors':
+            from pymodaq_utils.packages import extract_authors_from_description
+            authors = extract_authors_from_description(plug['description'])
+            if len(authors) == 0:
+                authors == plug[k]
+            doc, tag, text = Doc().tagtext()
+            with tag('ul'):
+                for auth in authors:
+                    with tag('li'):
+                        text(auth.rstrip())
+            tmp.append(doc.getvalue())
+        elif k == 'version':
+            tmp.append(f'<a href="{plug["homepage"]}" target="_top">{plug["version"]}</a> ')
+        elif k == 'description':
+            doc, tag, text = Doc().tagtext()
+            instruments = get_plugin_instruments(plug)
+            for inst in instruments:
+                text(inst)
+                for instt in instruments[inst]:
+                    with tag('ul'):
+                        with tag('li'):
+                            text(instt)
+            tmp.append(doc.getvalue())
+        else:
+            tmp.append(plug[k])
+    return tmp
 
 
-    plugins = get_pypi_plugins(browse_pypi=True)
-    base_path = Path(__file__).parent
+def _load_doc_rows(path: Path) -> Dict[str, List[str]]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = json.load(f)
+        if content.get('format') == DOC_FORMAT:
+            return content['rows']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return dict([])
 
-    header_keys = ['display-name', 'version', 'description']
-    header = ['Repo Name', 'Version plugin', 'Instruments']
-    plugins_tmp = []
 
-    plugins.sort(key=lambda plugin: plugin['plugin-name'].lower())
+def write_if_changed(path: Path, content: str) -> bool:
+    """Write a text file only if its content hash differs from the one of the existing file
 
-    for ind, plug in enumerate(plugins):
-        tmp = []
-
-        for k in header_keys:
-            if k == 'display-name':
-                tmp.append(f'<a href="{plug["homepage"].rstrip()}"'
-                           f' target="_top">'
-                           f'{capitalize(plug["plugin-name"].rstrip()[16:])}'
-                           f'</a> ')
-            elif k == 'authors':
-                authors = extract_authors_from_description(plug['description'])
-                if len(authors) == 0:
-                    authors == plug[k]
-                doc, tag, text = Doc().tagtext()
-                with tag('ul'):
-                    for auth in authors:
-                        with tag('li'):
-                            text(auth.rstrip())
-                tmp.append(doc.getvalue())
-            elif k == 'version':
-                tmp.append(f'<a href="{plug["homepage"]}" target="_top">{plug["version"]}</a> ')
-            elif k == 'description':
-                doc, tag, text = Doc().tagtext()
-                #text(plug[k]+'\r\n')
-                if plug['instruments'] != '':
-
-                    for inst in plug['instruments']:
-                        text(f'{inst}:')
-                        with tag('ul'):
-                            for instt in plug['instruments'][inst]:
-                                with tag('li'):
-                                    text(instt.rstrip())
-                    tmp.append(doc.getvalue())
-                else:
-                    lines = plug['description'].split('\n')
-                    header_inst = ['Actuators', 'Viewer0D', 'Viewer1D', 'Viewer2D', 'ViewerND']
-                    for header_ind, head in enumerate(header_inst):
-                        instrument_text = []
-                        for ind_line, line in enumerate(lines):
-                            if head in line:
-                                instrument_text.append(line.rstrip())
-                                for subline in lines[ind_line+1:]:
-                                    if subline[0:4] == '* **':
-                                        instrument_text.append(subline[2:].rstrip())
-                                    elif any([hd in subline for hd in header_inst[header_ind+1:]]):
-                                        break
-                        if len(instrument_text) > 1:
-                            text(instrument_text[0])
-                            for inst_txt in instrument_text[1:]:
-                                with tag('ul'):
-                                    with tag('li'):
-                                        text(inst_txt)
-
-
-                    tmp.append(doc.getvalue())
-                    # else:
-                    #     tmp.append('')
-            else:
-                tmp.append(plug[k])
-        plugins_tmp.append(tmp)
+    Returns
+    -------
+    bool: True if the file has been written
+    """
+    content = content.encode('utf-8')
+    if path.is_file() and get_plugin_sourcefile_id(path) == sha256(content).hexdigest():
+        return False
+    with open(path, 'wb') as f:
+        f.write(content)
+    return True
 
-    writer = MarkdownTableWriter(
-        table_name="PyMoDAQ Plugins",
-        headers=header,
-        value_matrix=plugins_tmp,
-        margin=1
-    )
-    writer.dump(base_path.parent.parent.joinpath('doc/PluginList.md'))
 
+def write_plugin_doc(root_path: Path = None, catalog_path: Path = CATALOG_PATH, cache: MetadataCache = None):
+    """Update the README and the compressed plugin catalog from info of all available plugins
 
-    with open(base_path.parent.parent.joinpath('README_base.md'), 'r') as f:
-        content = f.read()
-        content += '\r\n'
+    The rows of the plugin table are cached per (plugin, version) next to the metadata cache (persisted between runs of
+    the fetch_pypi_updates workflow) and the files are only written if their content changed. Nothing is written if a
+    package couldn't be fetched, the plugin list would otherwise miss it.
 
-    with open(base_path.parent.parent.joinpath('README.md'), 'w') as f:
-        content += writer.dumps()
-        f.write(content)
+    Parameters
+    ----------
+    root_path: Path
+        the folder containing README_base.md, where README.md and doc/PluginList.md are written (default to the root
+        of the repository)
+    catalog_path: Path
+        where to write the compressed catalog
+    cache: MetadataCache
+        the on-disk cache of the pypi metadata (default to the module one)
+
+    Raises
+    ------
+    FetchError: if the metadata of a package couldn't be fetched
+    """
+    from pytablewriter import MarkdownTableWriter
+
+    root_path = Path(__file__).parent.parent.parent if root_path is None else Path(root_path)
+    cache = metadata_cache if cache is None else cache
+
+    plugins = get_pypi_plugins(browse_pypi=True, cache=cache)
+    if len(plugins.failed) != 0:
+        raise FetchError(f'Could not fetch the metadata of the packages: {", ".join(plugins.failed)}, the plugin '
+                         f'list is not updated')
+    with profiler.phase('compatibility_matrix'):
+        compatibility = get_compatibility_matrix(plugins, cache=cache)
+    with profiler.phase('catalog_write'):
+        logger.info(f'Plugin catalog written with hash '
+                    f'{write_catalog(plugins, path=catalog_path, compatibility=compatibility)}')
+
+    header = ['Repo Name', 'Version plugin', 'Instruments']
+
+    plugins.sort(key=lambda plugin: plugin['plugin-name'].lower())
+
+    with profiler.phase('doc_render'):
+        cached_rows = _load_doc_rows(cache.doc_rows_path)
+        rows = dict([])
+        for plug in plugins:
+            key = f'{plug["plugin-name"]}=={plug["version"]}'
+            rows[key] = cached_rows[key] if key in cached_rows else render_plugin_row(plug)
+        if rows != cached_rows:
+            write_json_atomic(cache.doc_rows_path, {'format': DOC_FORMAT, 'rows': rows})
+
+        writer = MarkdownTableWriter(
+            table_name="PyMoDAQ Plugins",
+            headers=header,
+            value_matrix=list(rows.values()),
+            margin=1
+        )
+        table = writer.dumps()
+
+    with profiler.phase('doc_write'):
+        with open(root_path.joinpath('README_base.md'), 'r') as f:
+            content = f.read()
+            content += '\r\n'
+
+        for path, text in ((root_path.joinpath('doc/PluginList.md'), table),
+                           (root_path.joinpath('README.md'), content + table)):
+            if write_if_changed(path, text):
+                logger.info(f'{path} written')
+            else:
+                logger.info(f'{path} is up to date')
+
+
+def main():
+    """Entry point of write_plugins_doc"""
+    parser = argparse.ArgumentParser(description="Update the README, the plugin list and the compressed catalog of "
+                                                 "the PyMoDAQ plugins from the pypi server")
+    add_profile_argument(parser)
+    args = parser.parse_args()
+    profiler.enabled = args.profile is not None
+    try:
+        write_plugin_doc()
+    except FetchError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    if profiler.enabled:
+        profiler.dump(args.profile)
 
 
 if __name__ == '__main__':
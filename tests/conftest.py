@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures shared by the tests, the pypi server being replaced by the local stand-in of benchmarks/fake_pypi.py
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+BENCHMARKS_PATH = Path(__file__).parent.parent.joinpath('benchmarks')
+sys.path.insert(0, str(BENCHMARKS_PATH))
+
+from fake_pypi import FakePyPI  # noqa: E402
+
+from pymodaq_plugin_manager import cache as cache_module, session  # noqa: E402
+from pymodaq_plugin_manager.cache import MetadataCache, metadata_cache  # noqa: E402
+
+
+@pytest.fixture(scope='session', autouse=True)
+def default_cache_dir(tmp_path_factory):
+    """Keep the user's plugin manager cache out of reach of the tests"""
+    path = tmp_path_factory.mktemp('default_cache')
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(cache_module, 'get_default_cache_dir', lambda: path)
+        monkeypatch.setattr(metadata_cache, '_path', None)
+        yield path
+
+
+@pytest.fixture
+def fake_pypi():
+    """A fake pypi serving 5 synthetic plugins, used as the package index during the test"""
+    with FakePyPI(5) as server:
+        session.set_index_url(server.url)
+        session.close_session()
+        yield server
+    session.set_index_url()
+    session.close_session()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MetadataCache(tmp_path.joinpath('cache'))
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from qtpy import QtWidgets
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication([])
+    yield app
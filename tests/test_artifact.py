@@ -0,0 +1,65 @@
+import gzip
+import json
+import subprocess
+import sys
+
+from pymodaq_plugin_manager.artifact import write_catalog, load_catalog, load_compatibility_matrix
+from pymodaq_plugin_manager.catalog import PluginRecord
+
+INSTRUMENTS = {'Actuators': ['**Mock**: Mock actuator']}
+COMPATIBILITY = {'series': {'5.0': '5.0.6', '4.4': '4.4.7', '4.3': '4.3.7'},
+                 'plugins': {'pymodaq_plugins_mock': {'5.0': '5.1.0', '4.4': '4.2.0'},
+                             'pymodaq_plugins_new': {'5.0': '1.0.0'}}}
+
+
+def make_plugins():
+    return [PluginRecord(plugin_name='pymodaq_plugins_mock', display_name='Mock', version='5.1.0',
+                         description='Mock plugins of release 5.1.0', instruments=INSTRUMENTS, authors=['Me'],
+                         homepage='https://pypi.org/project/pymodaq_plugins_mock/'),
+            PluginRecord(plugin_name='pymodaq_plugins_new', display_name='New', version='1.0.0',
+                         description='New plugin', instruments=dict([]))]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path.joinpath('catalog.json.gz')
+    catalog_hash = write_catalog(make_plugins(), path=path, compatibility=COMPATIBILITY)
+    assert load_catalog(path) == make_plugins()
+    assert load_compatibility_matrix(path) == COMPATIBILITY
+    content = path.read_bytes()
+    assert write_catalog(make_plugins(), path=path, compatibility=COMPATIBILITY) == catalog_hash
+    assert path.read_bytes() == content  # deterministic
+
+
+def test_compatible_versions(tmp_path):
+    path = tmp_path.joinpath('catalog.json.gz')
+    write_catalog(make_plugins(), path=path, compatibility=COMPATIBILITY)
+
+    assert load_catalog(path, pymodaq_version='5.0.2') == make_plugins()
+    older = load_catalog(path, pymodaq_version='4.4.1')
+    assert [(plugin.plugin_name, plugin.version) for plugin in older] == [('pymodaq_plugins_mock', '4.2.0')]
+    # the description of the latest release doesn't describe the older one
+    assert older[0].description == '' and older[0].instruments == {}
+    assert older[0].homepage == 'https://pypi.org/project/pymodaq_plugins_mock/'
+    assert load_catalog(path, pymodaq_version='4.3.0') == []
+    assert load_catalog(path, pymodaq_version='3.6.0') is None  # unknown series
+
+
+def test_invalid_catalog(tmp_path):
+    path = tmp_path.joinpath('catalog.json.gz')
+    assert load_catalog(path) is None
+    write_catalog(make_plugins(), path=path)
+    with gzip.open(path, 'rb') as f:
+        catalog = json.loads(f.read().decode())
+    catalog['pymodaq-plugins'][0]['version'] = '6.0.0'
+    with gzip.open(path, 'wb') as f:
+        f.write(json.dumps(catalog).encode())
+    assert load_catalog(path) is None  # content hash mismatch
+
+
+def test_load_without_validation(tmp_path):
+    path = tmp_path.joinpath('catalog.json.gz')
+    write_catalog(make_plugins(), path=path)
+    code = ('import sys; from pymodaq_plugin_manager.artifact import load_catalog; '
+            f'assert len(load_catalog({str(path)!r}, validate=False)) == 2; '
+            'assert "jsonschema" not in sys.modules')
+    subprocess.run([sys.executable, '-c', code], check=True)
@@ -0,0 +1,92 @@
+import time
+
+from pymodaq_plugin_manager.cache import CatalogSnapshot, MetadataCache, save_last_plugins, load_last_plugins
+from pymodaq_plugin_manager.catalog import PluginRecord
+from pymodaq_plugin_manager.pypi import get_package_metadata
+
+PLUGIN = PluginRecord(plugin_name='pymodaq_plugins_mock', display_name='Mock', version='1.0.0', authors=['Me'])
+
+
+def test_metadata_cache_revalidation(fake_pypi, cache):
+    url = f'{fake_pypi.url}/pypi/pymodaq_plugins_synth00000/json'
+    content = cache.get(url)
+    assert content['info']['name'] == 'pymodaq_plugins_synth00000'
+    assert cache.get(url) == content  # fresh hit, no request
+    assert fake_pypi.requests == 1
+    assert cache.get(url, ttl=0) == content  # revalidated with a 304
+    assert fake_pypi.requests == 2
+    stats = cache.stats()
+    assert (stats['misses'], stats['hits'], stats['revalidated'], stats['entries']) == (1, 1, 1, 1)
+
+
+def test_metadata_cache_fallback(fake_pypi, cache):
+    url = f'{fake_pypi.url}/pypi/pymodaq_plugins_synth00000/json'
+    content = cache.get(url)
+    fake_pypi.add_failure('/pypi/pymodaq_plugins_synth00000/json', status=500)
+    assert cache.get(url, ttl=0) == content  # the expired entry is served on error
+    assert cache.stats()['stale'] == 1
+    assert cache.get(f'{fake_pypi.url}/pypi/unknown/json') is None
+
+
+def test_transient_not_found(fake_pypi, tmp_path):
+    cache = MetadataCache(tmp_path.joinpath('cache'), ttl=0)
+    fake_pypi.add_failure('/pypi/pymodaq_plugins_synth00000/2.0.0/json', status=404)
+    assert get_package_metadata('pymodaq_plugins_synth00000', '2.0.0', cache=cache) is None
+    metadata = get_package_metadata('pymodaq_plugins_synth00000', '2.0.0', cache=cache)  # not cached forever
+    assert metadata['info']['version'] == '2.0.0' and fake_pypi.requests == 2
+    assert get_package_metadata('pymodaq_plugins_synth00000', '2.0.0', cache=cache) == metadata  # immutable
+    assert fake_pypi.requests == 2
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path.joinpath('snapshot.json')
+    snapshot = CatalogSnapshot(path)
+    snapshot.update('4.4.0', '5.1.0', {'pymodaq_plugins_mock': (12, PLUGIN), 'pymodaq_plugins_none': (13, None),
+                                       'pymodaq_plugins_html': (None, PLUGIN)})
+    snapshot.save()
+
+    loaded = CatalogSnapshot(path)
+    found, plugin = loaded.lookup('4.4.0', '5.1.0', 'pymodaq_plugins_mock', 12)
+    assert found and PluginRecord.from_dict(plugin) == PLUGIN
+    assert loaded.lookup('4.4.0', '5.1.0', 'pymodaq_plugins_none', 13) == (True, None)
+    assert loaded.lookup('4.4.0', '5.1.0', 'pymodaq_plugins_mock', 14) == (False, None)  # new serial
+    assert loaded.lookup('4.4.0', '5.1.0', 'pymodaq_plugins_html', None) == (False, None)  # no serial, not stored
+    assert loaded.lookup('4.3.0', '5.1.0', 'pymodaq_plugins_mock', 12) == (False, None)  # other pymodaq version
+    assert loaded.lookup('4.4.0', '5.2.0', 'pymodaq_plugins_mock', 12) == (False, None)  # new pymodaq release
+
+    loaded.clear()
+    assert not path.exists()
+
+
+def test_snapshot_corrupted(tmp_path):
+    path = tmp_path.joinpath('snapshot.json')
+    path.write_text('{not json')
+    assert CatalogSnapshot(path).lookup(None, '5.1.0', 'pymodaq_plugins_mock', 12) == (False, None)
+
+
+def test_last_plugins(tmp_path):
+    path = tmp_path.joinpath('last_plugins.json')
+    assert load_last_plugins(path, '4.4.0') is None
+    start = time.time()
+    assert save_last_plugins(path, [PLUGIN], '4.4.0')
+    plugins, timestamp = load_last_plugins(path, '4.4.0')
+    assert [PluginRecord.from_dict(plugin) for plugin in plugins] == [PLUGIN]
+    assert timestamp >= start
+    assert load_last_plugins(path, '5.0.0') is None
+
+
+def test_snapshot_partial_update(tmp_path):
+    path = tmp_path.joinpath('snapshot.json')
+    snapshot = CatalogSnapshot(path)
+    snapshot.update(None, '5.1.0', {'pymodaq_plugins_mock': (12, PLUGIN), 'pymodaq_plugins_other': (13, PLUGIN)})
+    snapshot.update(None, '5.1.0', {'pymodaq_plugins_mock': (14, PLUGIN)}, partial=True)
+    snapshot.save()
+
+    loaded = CatalogSnapshot(path)
+    assert loaded.is_partial(None, '5.1.0')
+    assert loaded.lookup(None, '5.1.0', 'pymodaq_plugins_mock', 14)[0]
+    assert loaded.lookup(None, '5.1.0', 'pymodaq_plugins_other', 13)[0]  # kept from the previous refresh
+
+    loaded.update(None, '5.1.0', {'pymodaq_plugins_mock': (14, PLUGIN)})
+    assert not loaded.is_partial(None, '5.1.0')
+    assert not loaded.lookup(None, '5.1.0', 'pymodaq_plugins_other', 13)[0]
@@ -0,0 +1,84 @@
+import copy
+import pickle
+
+import pytest
+
+from pymodaq_plugin_manager.catalog import (PluginRecord, PluginCatalog, normalize_name, get_install_status,
+                                            AVAILABLE, INSTALLED, UPDATE)
+
+
+def make_plugin(name='pymodaq_plugins_mock', version='1.0.0', **kwargs):
+    return PluginRecord(plugin_name=name, display_name=name[16:], version=version, **kwargs)
+
+
+def test_normalize_name():
+    assert normalize_name('pymodaq_plugins_Mock') == normalize_name('pymodaq-plugins-mock')
+    assert normalize_name('pymodaq.plugins__mock') == 'pymodaq-plugins-mock'
+
+
+def test_record_immutable():
+    plugin = make_plugin()
+    with pytest.raises(AttributeError):
+        plugin.version = '2.0.0'
+    with pytest.raises(AttributeError):
+        del plugin.version
+    assert plugin['version'] == '1.0.0'
+
+
+def test_record_dict_access():
+    plugin = make_plugin(authors=['Me'])
+    assert plugin['plugin-name'] == 'pymodaq_plugins_mock'
+    assert plugin.get('unknown', 'default') == 'default'
+    with pytest.raises(KeyError):
+        plugin['unknown']
+    assert PluginRecord.from_dict(plugin.to_dict()) == plugin
+    assert plugin.to_dict()['authors'] == ('Me',)
+
+
+def test_record_mapping():
+    plugin = make_plugin(instruments={'Actuators': ['**Mock**: mock actuator']})
+    assert list(plugin) == list(PluginRecord.KEYS) and len(plugin) == len(PluginRecord.KEYS)
+    assert [key for key in plugin] == list(plugin.keys())
+    assert dict(plugin.items()) == plugin.to_dict() == dict(plugin)
+    assert plugin.values() == [plugin[key] for key in PluginRecord.KEYS]
+
+
+@pytest.mark.parametrize('duplicate', [copy.copy, copy.deepcopy, lambda plugin: pickle.loads(pickle.dumps(plugin))])
+def test_record_copy(duplicate):
+    plugin = make_plugin(authors=['Me'], instruments={'Actuators': ['**Mock**: mock actuator']})
+    duplicated = duplicate(plugin)
+    assert duplicated == plugin and duplicated.parsed_version == plugin.parsed_version
+    with pytest.raises(AttributeError):
+        duplicated.version = '2.0.0'
+
+
+def test_record_replace():
+    plugin = make_plugin(description='a description')
+    updated = plugin.replace(version='2.0.0')
+    assert updated.version == '2.0.0' and updated.parsed_version > plugin.parsed_version
+    assert updated.description is plugin.description
+    assert plugin.version == '1.0.0'
+
+
+def test_invalid_version():
+    assert make_plugin(version='not a version').parsed_version is None
+
+
+def test_install_status():
+    plugin = make_plugin(version='1.1.0')
+    assert get_install_status(plugin, None) == AVAILABLE
+    assert get_install_status(plugin, '1.0.0') == UPDATE
+    assert get_install_status(plugin, '1.1.0') == INSTALLED
+    assert get_install_status(plugin, '2.0.0') == INSTALLED
+    assert get_install_status(make_plugin(version='unknown'), '1.0.0') == INSTALLED
+
+
+def test_partition():
+    catalog = PluginCatalog([make_plugin('pymodaq_plugins_a', '1.0.0'), make_plugin('pymodaq_plugins_b', '2.0.0'),
+                             make_plugin('pymodaq_plugins_c', '1.0.0')])
+    assert 'pymodaq-plugins-A' in catalog
+    available, installed, update = catalog.partition({'pymodaq-plugins-b': '1.0.0', 'pymodaq_plugins_c': '1.0.0'})
+    assert [plugin.plugin_name for plugin in available] == ['pymodaq_plugins_a']
+    assert [(plugin.plugin_name, plugin.version) for plugin in installed] == [('pymodaq-plugins-b', '1.0.0'),
+                                                                              ('pymodaq_plugins_c', '1.0.0')]
+    assert [(plugin.plugin_name, plugin.version) for plugin in update] == [('pymodaq_plugins_b', '2.0.0')]
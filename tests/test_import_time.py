@@ -0,0 +1,13 @@
+import pytest
+
+from bench_import import DEFERRED_MODULES, MODULE, measure_import
+
+
+@pytest.fixture(scope='module')
+def imported_modules():
+    return measure_import()[1]
+
+
+@pytest.mark.parametrize('module', DEFERRED_MODULES)
+def test_deferred_module(imported_modules, module):
+    assert module not in imported_modules, f'{module} is imported with {MODULE}'
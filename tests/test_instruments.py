@@ -0,0 +1,68 @@
+from pymodaq_plugin_manager.catalog import PluginRecord
+from pymodaq_plugin_manager.instruments import (clear_instruments_cache, get_instruments, get_plugin_instruments,
+                                                parse_instruments)
+from pymodaq_plugin_manager.validate import render_plugin_row
+
+DESCRIPTION = '''pymodaq_plugins_mock
+####################
+
+Some text mentioning Viewer1D without being a section
+
+Instruments
+===========
+
+Actuators
++++++++++
+
+* **Mock**: Mock actuator
+* **MockTau**: Mock actuator with time constant
+
+Viewer0D
+++++++++
+
+* **Mock0D**: Mock 0D detector
+
+Viewer2D
+++++++++
+
+Installation instructions
+=========================
+
+* **Not an instrument**: in another section
+'''
+
+
+def test_parse_instruments():
+    instruments = parse_instruments(DESCRIPTION)
+    assert instruments == {'Actuators': ['**Mock**: Mock actuator', '**MockTau**: Mock actuator with time constant'],
+                           'Viewer0D': ['**Mock0D**: Mock 0D detector']}
+    assert list(instruments) == ['Actuators', 'Viewer0D']
+
+
+def test_parse_empty_description():
+    assert parse_instruments('') == {}
+    assert parse_instruments(None) == {}
+    assert parse_instruments('A description without any instrument') == {}
+
+
+def test_memoized_on_description():
+    clear_instruments_cache()
+    instruments = get_instruments(DESCRIPTION)
+    assert get_instruments(DESCRIPTION) is instruments
+    assert get_instruments('Another description') == {}
+
+
+def test_installed_record_instruments():
+    clear_instruments_cache()
+    latest = PluginRecord('pymodaq_plugins_mock', version='2.0.0', description=DESCRIPTION)
+    assert get_plugin_instruments(latest) == parse_instruments(DESCRIPTION)
+    installed = latest.replace(version='1.0.0', description='Actuators\n\n* **Old**: old actuator\n')
+    assert get_plugin_instruments(installed) == {'Actuators': ['**Old**: old actuator']}
+    assert get_plugin_instruments(latest.replace(version='1.5.0')) is get_plugin_instruments(latest)
+
+
+def test_render_instruments():
+    plugin = PluginRecord('pymodaq_plugins_mock', version='1.0.0', description=DESCRIPTION)
+    assert render_plugin_row(plugin, header_keys=('description',)) == [
+        'Actuators<ul><li>**Mock**: Mock actuator</li></ul><ul><li>**MockTau**: Mock actuator with time constant</li></ul>'
+        'Viewer0D<ul><li>**Mock0D**: Mock 0D detector</li></ul>']
@@ -0,0 +1,220 @@
+import sys
+import time
+
+import pytest
+from qtpy import QtCore, QtWidgets
+from qtpy.QtCore import Qt
+
+from pymodaq_plugin_manager import manager, artifact
+from pymodaq_plugin_manager.cache import metadata_cache
+from pymodaq_plugin_manager.catalog import PluginRecord
+from pymodaq_plugin_manager.search import FIELDS
+
+
+def make_plugin(name, version='1.0.0', description=''):
+    return PluginRecord(plugin_name=f'pymodaq_plugins_{name}', display_name=name.capitalize(), version=version,
+                        description=description, homepage=f'https://pypi.org/project/pymodaq_plugins_{name}/')
+
+
+class SearchProxy(manager.FilterProxy):
+    def search_fields(self):
+        return FIELDS
+
+
+def proxy_names(proxy):
+    return [proxy.index(row, 0).data() for row in range(proxy.rowCount())]
+
+
+def wait_fetched(plugin_manager, timeout=30.):
+    finished = []
+    plugin_manager.plugin_thread.plugin_fetcher.finished_signal.connect(lambda: finished.append(True))
+    start = time.monotonic()
+    while len(finished) == 0:
+        QtWidgets.QApplication.processEvents()
+        assert time.monotonic() - start < timeout
+    QtWidgets.QApplication.processEvents()
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    installed = dict([])  # installed plugin names and versions, to be modified by the tests
+    monkeypatch.setattr(manager, 'get_installed_plugins', lambda: dict(installed))
+    return installed
+
+
+@pytest.fixture
+def make_manager(qapp, fake_pypi, installed, tmp_path, monkeypatch):
+    monkeypatch.setattr(manager, 'get_pymodaq_version', lambda: None)
+    monkeypatch.setattr(metadata_cache, '_path', tmp_path.joinpath('cache'))
+    monkeypatch.setattr(manager, 'load_catalog', lambda **kwargs: None)
+    managers = []
+
+    def make():
+        widget = QtWidgets.QWidget()
+        plugin_manager = manager.PluginManager(widget)
+        managers.append((widget, plugin_manager))
+        return plugin_manager
+
+    yield make
+    for widget, plugin_manager in managers:
+        plugin_manager.stop_threads()
+
+
+def test_fetch(make_manager):
+    plugin_manager = make_manager()
+    wait_fetched(plugin_manager)
+    assert plugin_manager.model.rowCount(None) == 5
+    assert len(plugin_manager.stale_plugins) == 0
+    assert 'never' not in plugin_manager.refresh_label.text()
+
+
+def test_stop_threads(make_manager, fake_pypi):
+    fake_pypi.latency = 0.2
+    plugin_manager = make_manager()
+    while not plugin_manager.plugin_thread.isRunning():
+        QtWidgets.QApplication.processEvents()
+    plugin_manager.stop_threads()
+    assert not plugin_manager.plugin_thread.isRunning() and not plugin_manager.render_thread.isRunning()
+    assert not plugin_manager.plugin_thread.plugin_fetcher.complete
+
+
+def test_last_plugins_at_startup(make_manager, fake_pypi):
+    wait_fetched(make_manager())
+    del fake_pypi.projects['pymodaq_plugins_synth00001']
+
+    plugin_manager = make_manager()
+    model = plugin_manager.model
+    assert model.rowCount(None) == 5 and len(plugin_manager.stale_plugins) == 5
+    assert all(model.is_stale(row) for row in range(5))
+    wait_fetched(plugin_manager)
+    assert model.rowCount(None) == 4 and len(plugin_manager.stale_plugins) == 0
+    assert model.find_plugin('pymodaq_plugins_synth00001') == -1
+
+
+def test_catalog_at_first_start(make_manager, tmp_path, monkeypatch):
+    path = tmp_path.joinpath('catalog.json.gz')
+    artifact.write_catalog([make_plugin('shipped'), make_plugin('synth00000', '0.1.0')], path=path)
+    monkeypatch.setattr(manager, 'load_catalog', lambda **kwargs: artifact.load_catalog(path, **kwargs))
+
+    plugin_manager = make_manager()
+    model = plugin_manager.model
+    assert [plugin['plugin-name'] for plugin in model.plugins] == ['pymodaq_plugins_shipped',
+                                                                   'pymodaq_plugins_synth00000']
+    assert all(model.is_stale(row) for row in range(2))
+    wait_fetched(plugin_manager)  # checked against the index
+    assert model.find_plugin('pymodaq_plugins_shipped') == -1
+    assert model.plugins[model.find_plugin('pymodaq_plugins_synth00000')]['version'] == '2.0.0'
+    assert model.rowCount(None) == 5
+
+
+@pytest.mark.parametrize('code, cancel, restart', [('pass', False, True),
+                                                   ('import sys; sys.exit(1)', False, False),
+                                                   ('import os; os.abort()', False, False),
+                                                   ('import time; time.sleep(30)', True, False)])
+def test_subprocess_finished(make_manager, monkeypatch, code, cancel, restart):
+    plugin_manager = make_manager()
+    wait_fetched(plugin_manager)
+    asked = []
+    monkeypatch.setattr(plugin_manager, 'ask_restart', lambda: asked.append(True))
+    plugin_manager.model.selected[0] = True
+    finished = []
+
+    def callback(exit_code, cancelled):
+        finished.append((exit_code, cancelled))
+        plugin_manager.action_finished('install', [], exit_code, cancelled)
+
+    plugin_manager.do_subprocess([sys.executable, '-c', code], callback)
+    deleted = []
+    plugin_manager.job.destroyed.connect(lambda: deleted.append(True))
+    assert not plugin_manager.action_button.isEnabled()
+    if cancel:
+        while not plugin_manager.job.is_running():
+            QtWidgets.QApplication.processEvents()
+        plugin_manager.cancel_subprocess()
+    start = time.monotonic()
+    while len(finished) == 0:
+        QtWidgets.QApplication.processEvents()
+        assert time.monotonic() - start < 20
+    assert finished[0][1] is cancel and (finished[0][0] == 0) is restart
+    assert len(asked) == (1 if restart else 0)
+    assert plugin_manager.action_button.isEnabled() and plugin_manager.job is None
+    QtWidgets.QApplication.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    assert deleted == [True]
+
+
+def test_filter_after_changes(qapp):
+    model = manager.TableModel([make_plugin(name, description=description) for name, description in
+                                [('alpha', ''), ('beta', 'a laser'), ('gamma', ''), ('delta', 'laser diode')]])
+    proxy = SearchProxy()
+    proxy.setSourceModel(model)
+    proxy.setTextFilter('laser')
+    assert proxy_names(proxy) == ['Beta', 'Delta']
+
+    model.set_plugin(make_plugin('delta', '1.1.0', 'diode'))  # updated in place, not matching anymore
+    assert proxy_names(proxy) == ['Beta']
+    model.remove_plugins(['pymodaq_plugins_alpha'])  # rows shifted
+    model.set_plugin(make_plugin('beta', '1.1.0', 'a laser'))
+    assert proxy_names(proxy) == ['Beta']
+    model.set_plugin(make_plugin('gamma', '1.1.0', 'laser source'))  # updated in place, now matching
+    model.set_plugin(make_plugin('epsilon', description='fiber laser'))  # appended
+    assert sorted(proxy_names(proxy)) == ['Beta', 'Epsilon', 'Gamma']
+    proxy.setTextFilter('laser')
+    assert sorted(proxy_names(proxy)) == ['Beta', 'Epsilon', 'Gamma']
+
+
+def check_model(model):
+    assert len(model.plugins) == len(model._status) == len(model.selected) == model.rowCount(None)
+    assert [model.get_data(row, 0) for row in range(model.rowCount(None))] == \
+        [plugin['display-name'] for plugin in model.plugins]
+    assert len(model.search_index) == len(model.plugins)
+    for row, plugin in enumerate(model.plugins):
+        assert model.find_plugin(plugin['plugin-name']) == row
+        assert model.search_index.search(plugin['plugin-name'], ('name',)) == {row}
+
+
+def test_model_rows(qapp):
+    names = ['alpha', 'beta', 'gamma', 'delta', 'epsilon']
+    model = manager.TableModel([make_plugin(name) for name in names], installed={'pymodaq_plugins_beta': '0.1.0'})
+    check_model(model)
+    assert model.get_status(1) == manager.UPDATE
+
+    model.removeRows(1, 2, model.index(-1, -1))
+    check_model(model)
+    assert [plugin['display-name'] for plugin in model.plugins] == ['Alpha', 'Delta', 'Epsilon']
+
+    model.insert_rows_data(1, [make_plugin('beta'), make_plugin('zeta')])
+    check_model(model)
+    assert model.get_status(1) == manager.UPDATE and model.find_plugin('pymodaq_plugins_zeta') == 2
+
+    model.append_plugin(make_plugin('eta'))
+    model.remove_rows([0, 2, 3])
+    check_model(model)
+    assert [plugin['display-name'] for plugin in model.plugins] == ['Beta', 'Epsilon', 'Eta']
+
+    model.reset_data([make_plugin('theta')])
+    check_model(model)
+    assert model.get_data_all() == [make_plugin('theta')]
+    model.clear()
+    check_model(model)
+    assert model.find_plugin('pymodaq_plugins_theta') == -1
+
+
+def test_selection_cleared_on_status_change(qapp):
+    model = manager.TableModel([make_plugin('alpha'), make_plugin('beta')])
+    installed_proxy = manager.FilterProxy(statuses=manager.VIEWS['Installed'][1])
+    installed_proxy.setSourceModel(model)
+    model.selected[0] = model.selected[1] = True
+    model.set_installed({'pymodaq_plugins_alpha': '1.0.0'})
+    assert model.selected == [False, True]
+    assert installed_proxy.rowCount() == 1
+    assert installed_proxy.index(0, 0).data(Qt.CheckStateRole) == Qt.CheckState.Unchecked
+
+
+def test_crash_is_a_failure(qapp):
+    job = manager.PipJob(['pip'])
+    job._start = time.perf_counter()
+    finished = []
+    job.finished_signal.connect(lambda exit_code, cancelled, duration: finished.append(exit_code))
+    job._finished(0, QtCore.QProcess.ExitStatus.CrashExit)
+    job._finished(0, QtCore.QProcess.ExitStatus.NormalExit)
+    assert finished == [manager.FAILED_EXIT_CODE, 0]
@@ -0,0 +1,14 @@
+from pymodaq_plugin_manager.catalog import PluginRecord
+from pymodaq_plugin_manager.rendering import RenderCache
+
+
+def test_render_cache():
+    cache = RenderCache(maxsize=2)
+    latest = PluginRecord('pymodaq_plugins_mock', version='2.0.0', description='Latest release')
+    installed = latest.replace(description='Installed release')
+    assert 'Latest release' in cache.get(latest)
+    assert installed not in cache
+    assert 'Installed release' in cache.get(installed)
+    assert latest.replace(version='1.0.0') in cache
+    cache.get(PluginRecord('pymodaq_plugins_other', description='Other'))
+    assert len(cache) == 2 and latest not in cache
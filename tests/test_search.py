@@ -0,0 +1,66 @@
+import pytest
+
+from pymodaq_plugin_manager.catalog import PluginRecord
+from pymodaq_plugin_manager.search import SearchIndex
+
+DESCRIPTION = '''Instruments
+===========
+
+Actuators
++++++++++
+
+* **{instrument}**: a stage
+'''
+
+
+def make_plugin(name, description='', instrument='Stage'):
+    return PluginRecord(plugin_name=f'pymodaq_plugins_{name}', display_name=name.capitalize(), version='1.0.0',
+                        description=description + DESCRIPTION.format(instrument=instrument))
+
+
+@pytest.fixture
+def plugins():
+    return [make_plugin('thorlabs', 'Thorlabs kinesis controllers', 'KDC101'),
+            make_plugin('andor', 'Andor cameras', 'Andor_Camera'),
+            make_plugin('mock', 'Mock plugins for tests', 'MockStage'),
+            make_plugin('daqmx', 'National Instruments cards', 'DAQmx_Analog')]
+
+
+def brute_force(plugins, index, text, fields):
+    return set([row for row in range(len(plugins)) if index.match(row, text.lower(), fields)])
+
+
+@pytest.mark.parametrize('text', ['', 'thor', 'CAMERA', 'mock plugins', 'or', 'xyz', 'ins', 'stage', 'kdc'])
+@pytest.mark.parametrize('fields', [('name',), ('description',), ('instruments',),
+                                    ('name', 'description', 'instruments')])
+def test_search_matches_brute_force(plugins, text, fields):
+    index = SearchIndex(plugins)
+    assert index.search(text, fields) == brute_force(plugins, index, text, fields)
+
+
+def test_search_fields(plugins):
+    index = SearchIndex(plugins)
+    assert index.search('andor', ('name',)) == {1}
+    assert index.search('cameras', ('name',)) == set()
+    assert index.search('cameras', ('description',)) == {1}
+    assert index.search('kdc101', ('instruments',)) == {0}
+
+
+def test_add_and_set(plugins):
+    index = SearchIndex(plugins[:2])
+    index.add(plugins[2])
+    assert len(index) == 3
+    assert index.search('mock', ('name',)) == {2}
+    index.set(0, make_plugin('newport', 'Newport controllers', 'SMC100'))
+    assert index.search('thorlabs') == set()
+    assert index.search('newport') == {0}
+    assert index.search('smc100', ('instruments',)) == {0}
+
+
+def test_revisions(plugins):
+    index = SearchIndex(plugins[:2])
+    revision = index.revision
+    assert index.get_revision(0) < index.get_revision(1) <= revision
+    index.add(plugins[2])
+    index.set(0, make_plugin('newport', 'Newport controllers', 'SMC100'))
+    assert index.get_revision(1) <= revision < index.get_revision(2) < index.get_revision(0) == index.revision
@@ -0,0 +1,75 @@
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from pymodaq_plugin_manager import session
+from pymodaq_plugin_manager.session import FetchError, get_retry_delay
+
+PATH = '/pypi/pymodaq_plugins_synth00000/json'
+
+
+def response(retry_after=None):
+    return SimpleNamespace(headers=dict([]) if retry_after is None else {'Retry-After': retry_after})
+
+
+def test_retry_delay():
+    assert get_retry_delay(response('2'), 0) == 2.
+    assert get_retry_delay(response('-1'), 0) == 0.
+    date = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < get_retry_delay(response(date), 0) <= 30
+    assert get_retry_delay(response('not a date'), 1) == session.BACKOFF_BASE * 2
+    assert get_retry_delay(None, 0) == session.BACKOFF_BASE
+    assert get_retry_delay(None, 100) == session.BACKOFF_MAX
+
+
+def test_get(fake_pypi):
+    rep = session.get(f'{fake_pypi.url}{PATH}')
+    assert rep.status_code == 200
+    assert rep.json()['info']['name'] == 'pymodaq_plugins_synth00000'
+
+
+def test_retry_after(fake_pypi):
+    fake_pypi.add_failure(PATH, status=503, count=2, retry_after='0.2')
+    start = time.monotonic()
+    rep = session.get(f'{fake_pypi.url}{PATH}')
+    assert rep.status_code == 200
+    assert time.monotonic() - start >= 0.4
+    assert fake_pypi.requests == 3
+
+
+def test_long_retry_after(fake_pypi):
+    fake_pypi.add_failure(PATH, status=503, retry_after='3600')
+    start = time.monotonic()
+    assert session.get(f'{fake_pypi.url}{PATH}').status_code == 503
+    assert time.monotonic() - start < 1.
+    assert fake_pypi.requests == 1
+
+
+def test_retries_exhausted(fake_pypi):
+    fake_pypi.add_failure(PATH, status=429, count=None, retry_after='0')
+    rep = session.get(f'{fake_pypi.url}{PATH}', retries=2)
+    assert rep.status_code == 429
+    assert fake_pypi.requests == 3
+
+
+def test_no_retry_on_404(fake_pypi):
+    assert session.get(f'{fake_pypi.url}/pypi/unknown/json').status_code == 404
+    assert fake_pypi.requests == 1
+
+
+def test_deadline(fake_pypi):
+    fake_pypi.add_failure(PATH, status=503, count=None, retry_after='5')
+    start = time.monotonic()
+    rep = session.get(f'{fake_pypi.url}{PATH}', deadline=time.monotonic() + 1.)
+    assert rep.status_code == 503  # waiting 5 s would exceed the deadline: the error is returned at once
+    assert time.monotonic() - start < 1.
+    with pytest.raises(FetchError):
+        session.get(f'{fake_pypi.url}{PATH}', deadline=time.monotonic() - 1.)
+
+
+def test_connection_error():
+    with pytest.raises(FetchError):
+        session.get('http://127.0.0.1:1/simple/', retries=0)
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+from qtpy.QtCore import Qt
+
+from pymodaq_plugin_manager.utils import ArrayTableModel, TableModel, get_ranges
+
+
+@pytest.mark.parametrize('rows, ranges', [([], []),
+                                          ([3], [(3, 1)]),
+                                          ([5, 1, 2, 3, 7, 8, 2], [(1, 3), (5, 1), (7, 2)])])
+def test_get_ranges(rows, ranges):
+    assert get_ranges(rows) == ranges
+
+
+@pytest.fixture
+def model(qapp):
+    return TableModel([[row, 10 * row] for row in range(6)], header=['a', 'b'])
+
+
+def test_remove_rows(model):
+    removed = []
+    model.rowsAboutToBeRemoved.connect(lambda parent, first, last: removed.append((first, last)))
+    model.remove_rows([0, 4, 1, 5])
+    assert model.get_data_all() == [[2, 20], [3, 30]]
+    assert removed == [(4, 5), (0, 1)]
+
+
+def test_remove_several_rows(model):
+    assert model.removeRows(1, 3, model.index(-1, -1))
+    assert model.get_data_all() == [[0, 0], [4, 40], [5, 50]]
+    assert model.rowCount(None) == 3 and len(model._checked) == 3
+
+
+def test_insert_rows_data(model):
+    inserted = []
+    model.rowsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+    model.insert_rows_data(2, [[7, 70], [8, 80]])
+    assert [row[0] for row in model.get_data_all()] == [0, 1, 7, 8, 2, 3, 4, 5]
+    assert inserted == [(2, 3)]
+
+
+def test_reset_data(model):
+    resets = []
+    model.modelReset.connect(lambda: resets.append(True))
+    model.reset_data([[1, 2]])
+    assert model.get_data_all() == [[1, 2]] and len(model._checked) == 1
+    model.clear()
+    assert model.rowCount(None) == 0 and len(model._checked) == 0
+    assert len(resets) == 2
+
+
+@pytest.fixture(params=[float, [int, float, bool]], ids=['single', 'mixed'])
+def array_model(qapp, request):
+    return ArrayTableModel([[1, 1.5, 0], [2, 2.5, 1], [3, 3.5, 0]], header=['a', 'b', 'c'], dtypes=request.param)
+
+
+def test_array_round_trip(array_model):
+    rows = [[array_model.get_data(row, col) for col in range(3)] for row in range(3)]
+    array_model.set_data_all(array_model.get_data_all())
+    assert [[array_model.get_data(row, col) for col in range(3)] for row in range(3)] == rows
+    array_model.set_data_all(np.array(rows))
+    assert [[array_model.get_data(row, col) for col in range(3)] for row in range(3)] == rows
+
+
+def test_array_dtypes(qapp):
+    model = ArrayTableModel(np.array([[1.7, 2.5, 0.]]), header=['a', 'b', 'c'], dtypes=[int, float, bool])
+    assert model.get_data_all().dtype.names is not None
+    assert [model.data(model.index(0, col), Qt.DisplayRole) for col in range(3)] == [1, 2.5, False]
+    assert [type(model.get_data(0, col)) for col in range(3)] == [int, float, bool]
+    model = ArrayTableModel([[1, 2]], header=['a', 'b'], dtypes=int)
+    assert model.get_data_all().dtype == np.dtype(int) and model.get_data_all().shape == (1, 2)
+
+
+def test_array_hooks(array_model):
+    array_model.insert_rows_data(1, [[7, 7.5, 1], [8, 8.5, 0]])
+    assert [array_model.get_data(row, 0) for row in range(5)] == [1, 7, 8, 2, 3]
+    assert array_model.removeRows(0, 2, array_model.index(-1, -1))
+    array_model.remove_rows([2])
+    assert [array_model.get_data(row, 1) for row in range(2)] == [8.5, 2.5]
+    assert array_model.rowCount(None) == len(array_model._checked) == 2
+    array_model.insert_data(2, [9, 9.5, 1])
+    assert array_model.get_data(2, 1) == 9.5
+    array_model.clear()
+    assert array_model.rowCount(None) == 0 and len(array_model.get_data_all()) == 0
+
+
+def test_array_raw_data(array_model):
+    raw_data = array_model.raw_data
+    assert not raw_data.flags.writeable
+    with pytest.raises(ValueError):
+        raw_data[0] = raw_data[1]
+    assert np.shares_memory(raw_data, array_model.get_data_all())
+    assert array_model.setData(array_model.index(0, 1), 4.5, Qt.EditRole)
+    assert array_model.get_data(0, 1) == 4.5 and raw_data[0][1] == 4.5
+
+
+def test_array_set_data(qapp):
+    model = ArrayTableModel([[1, 1.5]], header=['a', 'b'], dtypes=[np.int8, float])
+    assert model.setData(model.index(0, 1), '2.5', Qt.EditRole) and model.get_data(0, 1) == 2.5
+    assert model.setData(model.index(0, 0), 12.0, Qt.EditRole) and model.get_data(0, 0) == 12
+    for col, value in [(1, 'not a number'), (0, None), (0, 300)]:
+        assert not model.setData(model.index(0, col), value, Qt.EditRole)
+    assert [model.get_data(0, col) for col in range(2)] == [12, 2.5]
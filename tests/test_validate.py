@@ -0,0 +1,102 @@
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+from packaging.version import Version
+
+from pymodaq_plugin_manager.artifact import load_catalog
+from pymodaq_plugin_manager.cache import CatalogSnapshot, MetadataCache
+from pymodaq_plugin_manager.session import FetchError
+from pymodaq_plugin_manager.validate import get_pypi_plugins, iter_pypi_plugins, write_plugin_doc
+
+
+def quiet(message):
+    pass
+
+
+def test_get_pypi_plugins(fake_pypi, cache):
+    plugins = get_pypi_plugins(print_method=quiet, cache=cache)
+    assert [plugin['plugin-name'] for plugin in plugins] == [f'pymodaq_plugins_synth{ind:05d}' for ind in range(5)]
+    assert all(plugin['version'] == '2.0.0' for plugin in plugins)
+    assert list(plugins[0]['instruments']) == ['Actuators', 'Viewer0D', 'Viewer2D']
+    assert plugins.failed == {}
+
+
+def test_get_pypi_plugins_pinned_version(fake_pypi, cache):
+    plugins = get_pypi_plugins(pymodaq_version=Version('4.4.0'), print_method=quiet, cache=cache)
+    assert set([plugin['version'] for plugin in plugins]) == {'1.1.0'}
+
+
+def test_snapshot_reuse(fake_pypi, cache):
+    get_pypi_plugins(print_method=quiet, cache=cache)
+    requests = fake_pypi.requests
+    assert len(get_pypi_plugins(print_method=quiet, cache=cache)) == 5
+    assert fake_pypi.requests - requests == 1  # only the package list, the serials didn't move
+
+
+def test_failed_package(fake_pypi, cache):
+    fake_pypi.add_failure('/pypi/pymodaq_plugins_synth00001/json', status=500, count=None)
+    plugins = get_pypi_plugins(print_method=quiet, cache=cache)
+    assert len(plugins) == 4
+    assert list(plugins.failed) == ['pymodaq_plugins_synth00001']
+
+
+def test_iter_pypi_plugins(fake_pypi, cache):
+    failed = dict([])
+    plugins = list(iter_pypi_plugins(print_method=quiet, cache=cache, failed=failed))
+    assert len(plugins) == 5 and failed == {}
+
+
+def test_interrupted_fetch_saves_snapshot(fake_pypi, cache, tmp_path):
+    get_pypi_plugins(print_method=quiet, cache=MetadataCache(tmp_path.joinpath('cold')))
+    cold_requests = fake_pypi.requests
+
+    plugins = iter_pypi_plugins(print_method=quiet, cache=cache, max_workers=1)
+    first = next(plugins)
+    plugins.close()  # the consumer stops early
+
+    snapshot = CatalogSnapshot(cache.snapshot_path)
+    assert snapshot.is_partial(None, '5.1.0')
+    assert snapshot.lookup(None, '5.1.0', first['plugin-name'], fake_pypi.projects[first['plugin-name']]['serial'])[0]
+
+    requests = fake_pypi.requests
+    assert len(get_pypi_plugins(print_method=quiet, cache=cache)) == 5
+    assert not CatalogSnapshot(cache.snapshot_path).is_partial(None, '5.1.0')
+    # the first plugin is not resolved again, the one being resolved at the close having been cached
+    assert fake_pypi.requests - requests <= cold_requests - 1
+
+
+def test_no_worker_after_close(fake_pypi, cache):
+    fake_pypi.latency = 0.05
+    plugins = iter_pypi_plugins(pymodaq_version=Version('4.4.0'), print_method=quiet, cache=cache, max_workers=2)
+    next(plugins)
+    plugins.close()
+    requests = fake_pypi.requests
+    time.sleep(0.3)
+    assert fake_pypi.requests == requests
+
+
+@pytest.fixture
+def doc_root(tmp_path):
+    root = tmp_path.joinpath('root')
+    root.joinpath('doc').mkdir(parents=True)
+    shutil.copy(Path(__file__).parent.parent.joinpath('README_base.md'), root)
+    return root
+
+
+def test_write_plugin_doc(fake_pypi, cache, doc_root):
+    write_plugin_doc(root_path=doc_root, catalog_path=doc_root.joinpath('catalog.json.gz'), cache=cache)
+    readme = doc_root.joinpath('README.md').read_text()
+    assert all(f'Synth{ind:05d}' in readme for ind in range(5))
+    assert doc_root.joinpath('doc/PluginList.md').read_text() in readme
+    assert len(load_catalog(doc_root.joinpath('catalog.json.gz'))) == 5
+
+
+def test_write_plugin_doc_failed_package(fake_pypi, cache, doc_root):
+    fake_pypi.add_failure('/pypi/pymodaq_plugins_synth00003/json', status=503, count=None, retry_after='0')
+    with pytest.raises(FetchError, match='pymodaq_plugins_synth00003'):
+        write_plugin_doc(root_path=doc_root, catalog_path=doc_root.joinpath('catalog.json.gz'), cache=cache)
+    assert not doc_root.joinpath('README.md').exists()
+    assert not doc_root.joinpath('doc/PluginList.md').exists()
+    assert not doc_root.joinpath('catalog.json.gz').exists()